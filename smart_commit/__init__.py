@@ -9,7 +9,15 @@ __version__ = "2.0.0"
 __author__ = "Nicholas"
 __email__ = "clearcmos@domain.com"
 
-from smart_commit.core import SmartCommit
-from smart_commit.config.settings import Settings
+__all__ = ["SmartCommit", "Settings"]
 
-__all__ = ["SmartCommit", "Settings"]
\ No newline at end of file
+
+def __getattr__(name):
+    """Import the public API on first access to keep CLI startup fast."""
+    if name == "SmartCommit":
+        from smart_commit.core import SmartCommit
+        return SmartCommit
+    if name == "Settings":
+        from smart_commit.config.settings import Settings
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,12 +3,16 @@ Abstract base class for AI backends with plugin architecture.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import time
+import aiohttp
 from loguru import logger
 
 
+DEBUG_LEVEL = logger.level("DEBUG").no
+
+
 class ValidationError(ValueError):
     """Custom exception for validation failures that should not be retried."""
     pass
@@ -29,12 +33,41 @@ class AIResponse:
 class AIBackend(ABC):
     """Abstract base class for AI backends."""
     
-    def __init__(self, api_url: str, model: str, timeout: int = 120):
+    # Backends that set this provide an async embed(text) -> List[float]
+    supports_embeddings = False
+    
+    def __init__(self, api_url: str, model: str, timeout: int = 120, connection_pool_size: int = 16):
         """Initialize the AI backend."""
         self.api_url = api_url.rstrip('/')
         self.model = model
         self.timeout = timeout
+        self.connection_pool_size = connection_pool_size
+        self.embedding_model = "nomic-embed-text"
+        self.prompt_cache = True
+        self.keep_alive = "10m"
         self.backend_type = self.__class__.__name__.lower().replace('backend', '')
+        self.connection_failed = False
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=max(64, self.connection_pool_size),
+                    limit_per_host=self.connection_pool_size,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                )
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     @abstractmethod
     async def call_api(self, prompt: str) -> AIResponse:
@@ -51,13 +84,31 @@ class AIBackend(ABC):
         """List available models from the backend."""
         pass
     
+    async def stream_generate(self, prompt: str) -> AsyncIterator[str]:
+        """Yield generated text as it arrives; by default the whole response at once."""
+        response = await self.call_api(prompt)
+        yield response.content
+    
+    async def warmup(self) -> None:
+        """Prepare the backend for the first real request; a no-op unless overridden."""
+        return None
+    
+    async def parallel_slots(self) -> Optional[int]:
+        """Get how many requests the server processes at once, or None if it doesn't say."""
+        return None
+    
     def _log_request(self, prompt: str) -> None:
         """Log the API request details."""
+        # Skip all formatting when no sink accepts DEBUG records
+        if logger._core.min_level > DEBUG_LEVEL:
+            return
+        
         logger.debug(f"AI API request to {self.backend_type}")
         logger.debug(f"URL: {self.api_url}")
         logger.debug(f"Model: {self.model}")
         logger.debug(f"Prompt length: {len(prompt)} characters")
         logger.debug(f"Timeout: {self.timeout}s")
+        logger.opt(lazy=True).debug("Prompt: {}", lambda: prompt[:500])
     
     def _log_response(self, response: AIResponse) -> None:
         """Log the API response details."""
@@ -106,7 +157,51 @@ class AIBackend(ABC):
                     await asyncio.sleep(wait_time)
         
         logger.debug(f"All {max_retries} AI API attempts failed")
+        if isinstance(last_exception, aiohttp.ClientError):
+            # Connection and HTTP status errors mean the server is no longer known to be healthy
+            self.connection_failed = True
         raise last_exception
+    
+    async def batch_generate(
+        self,
+        prompts: List[str],
+        max_concurrency: int = 2,
+        max_retries: int = 3
+    ) -> List[Union[AIResponse, BaseException]]:
+        """Call the AI API for several prompts concurrently.
+        
+        Results are returned in prompt order; a failed prompt yields its exception.
+        """
+        results = {
+            index: result
+            async for index, result in self.iter_batch_generate(prompts, max_concurrency, max_retries)
+        }
+        return [results[index] for index in range(len(prompts))]
+    
+    async def iter_batch_generate(
+        self,
+        prompts: List[str],
+        max_concurrency: int = 2,
+        max_retries: int = 3
+    ) -> AsyncIterator[Tuple[int, Union[AIResponse, BaseException]]]:
+        """Yield (prompt index, result) pairs as concurrent API calls complete."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(index: int, prompt: str) -> Tuple[int, Union[AIResponse, BaseException]]:
+            async with semaphore:
+                try:
+                    return index, await self.call_with_retry(prompt, max_retries=max_retries)
+                except Exception as e:
+                    return index, e
+        
+        tasks = [asyncio.create_task(_one(i, prompt)) for i, prompt in enumerate(prompts)]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            # A consumer that stops early must not leave requests running behind it
+            for task in tasks:
+                task.cancel()
 
 
 import asyncio
\ No newline at end of file
@@ -54,11 +54,16 @@ class BackendFactory:
         
         backend_class = cls._backends[backend_type]
         
-        return backend_class(
+        backend = backend_class(
             api_url=settings.ai.api_url,
             model=settings.ai.model,
-            timeout=settings.ai.timeout
+            timeout=settings.ai.timeout,
+            connection_pool_size=settings.ai.connection_pool_size
         )
+        backend.embedding_model = settings.ai.embedding_model
+        backend.prompt_cache = settings.ai.prompt_cache
+        backend.keep_alive = settings.ai.keep_alive
+        return backend
     
     @classmethod
     async def _detect_backend(cls, settings: Settings) -> Optional[str]:
@@ -71,9 +76,12 @@ class BackendFactory:
             timeout=5  # Quick probe
         )
         
-        if await llamacpp.health_check():
-            logger.info("Auto-detected llama.cpp backend")
-            return "llamacpp"
+        try:
+            if await llamacpp.health_check():
+                logger.info("Auto-detected llama.cpp backend")
+                return "llamacpp"
+        finally:
+            await llamacpp.aclose()
         
         # Test Ollama
         ollama = OllamaBackend(
@@ -82,9 +90,12 @@ class BackendFactory:
             timeout=5  # Quick probe
         )
         
-        if await ollama.health_check():
-            logger.info("Auto-detected Ollama backend")
-            return "ollama"
+        try:
+            if await ollama.health_check():
+                logger.info("Auto-detected Ollama backend")
+                return "ollama"
+        finally:
+            await ollama.aclose()
         
         logger.warning("No backend detected via health checks")
         return None
@@ -97,7 +108,10 @@ class BackendFactory:
         for backend_type in cls._backends:
             try:
                 backend = cls._create_backend_instance(backend_type, settings)
-                results[backend_type] = await backend.health_check()
+                try:
+                    results[backend_type] = await backend.health_check()
+                finally:
+                    await backend.aclose()
             except Exception as e:
                 logger.debug(f"Failed to test {backend_type}: {e}")
                 results[backend_type] = False
@@ -4,19 +4,40 @@ llama.cpp AI backend implementation.
 
 import asyncio
 import aiohttp
+import orjson
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from loguru import logger
 
 from smart_commit.ai_backends.base import AIBackend, AIResponse
 
 
+# Semantic scope variations accepted as equivalent (e.g., 'ui' vs 'components')
+SEMANTIC_MAPPINGS: Dict[str, List[str]] = {
+    'docs': ['docs', 'documentation', 'readme', 'claude'],
+    'ui': ['ui', 'components', 'frontend', 'react'],
+    'api': ['api', 'backend', 'server', 'routes'],
+    'core': ['core', 'main', 'app', 'smart_commit'],
+    'utils': ['utils', 'utilities', 'helpers', 'common']
+}
+
+# Inverted lookup: scope variation -> canonical scope
+_SCOPE_CANON: Dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in SEMANTIC_MAPPINGS.items()
+    for alias in aliases
+}
+
+# Start of a conventional commit with scope, e.g. "feat(scope):"
+_CONVENTIONAL_RE = re.compile(r'[a-z]+\([^)]+\):', re.IGNORECASE)
+
+
 class LlamaCppBackend(AIBackend):
     """llama.cpp AI backend implementation."""
     
-    def __init__(self, api_url: str, model: str, timeout: int = 120):
+    def __init__(self, api_url: str, model: str, timeout: int = 120, connection_pool_size: int = 16):
         """Initialize llama.cpp backend."""
-        super().__init__(api_url, model, timeout)
+        super().__init__(api_url, model, timeout, connection_pool_size)
         self.backend_type = "llamacpp"
         
         # Auto-detect model if not specified
@@ -85,225 +106,234 @@ Output the commit message directly, for example: feat(scope): description
             "top_p": 0.1,        # Much lower for code/structured completion
             "min_p": 0,          # Qwen recommendation
             "stop": ["<|im_end|>", "\n\n", " for\n", " to\n", " with\n"],  # ChatML + preposition stops
-            "stream": False
+            "stream": True,
+            "cache_prompt": self.prompt_cache  # Reuse the KV cache of the shared prompt prefix
         }
         
         # Use a shorter timeout for individual requests to avoid hanging
         request_timeout = min(self.timeout, 30)  # Cap at 30 seconds per request
         
         api_start = time.time()
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{self.api_url}/v1/completions",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=request_timeout)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    # Debug logging for response (only visible with --debug)
-                    logger.debug(f"Raw llama.cpp response: {data}")
-                    
-                    # Extract response from OpenAI-compatible format
-                    choices = data.get("choices", [])
-                    if not choices:
-                        logger.error(f"No choices in llama.cpp response: {data}")
-                        raise ValueError("No choices in llama.cpp response")
-                    
-                    content = choices[0].get("text", "").strip()
-                    
-                    # Clean up common AI formatting issues progressively
-                    original_content = content
-                    
-                    # Step 1: Remove markdown code blocks with language specifiers
-                    if content.startswith('```commit'):
-                        content = content[8:].strip()
-                    elif content.startswith('```') and content.endswith('```'):
-                        content = content[3:-3].strip()
-                    
-                    # Step 2: Remove explanatory prefixes (e.g., "**Correct**:", "Answer:", etc.)
-                    prefixes_to_remove = [
-                        '**Correct**:', '**Answer**:', '**Response**:', '**Commit**:',
-                        'Correct:', 'Answer:', 'Response:', 'Commit:', 'Message:',
-                        'Here is the commit message:', 'The commit message is:',
-                        'Commit Message:', 'Commit message:', 'commit message:',
-                        'The answer is:', 'The response is:', 'Here is the answer:',
-                        'Here is the response:', 'Here is what I found:',
-                        'Based on the changes:', 'After analyzing the code:',
-                        'I can see that:', 'Looking at the diff:'
-                    ]
-                    
-                    # More aggressive cleanup - look for patterns that start with explanatory text
-                    content_lower = content.lower()
-                    for prefix in prefixes_to_remove:
-                        prefix_lower = prefix.lower()
-                        if content_lower.startswith(prefix_lower):
-                            content = content[len(prefix):].strip()
-                            logger.debug(f"Removed prefix '{prefix}' from response")
+        session = await self._get_session()
+        try:
+            async with session.post(
+                f"{self.api_url}/v1/completions",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=request_timeout),
+                raise_for_status=True
+            ) as response:
+                # Consume the SSE stream and stop as soon as a complete
+                # conventional commit line is available
+                chunks: List[str] = []
+                data: Dict[str, Any] = {}
+                async for raw_line in response.content:
+                    line = raw_line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    line = line[5:].strip()
+                    if line == b"[DONE]":
+                        break
+                    
+                    data = orjson.loads(line)
+                    choices = data.get("choices") or [{}]
+                    text = choices[0].get("text", "")
+                    chunks.append(text)
+                    
+                    if "\n" in text:
+                        buffer = "".join(chunks)
+                        match = _CONVENTIONAL_RE.search(buffer)
+                        if match and "\n" in buffer[match.end():]:
+                            # Closing the connection cancels generation server-side
+                            logger.debug("Complete commit line received, stopping stream early")
+                            response.close()
                             break
-                    
-                    # Additional cleanup for variations like "Commit Message:fix(...)" (no space)
-                    if content_lower.startswith('commit message:'):
-                        # Find the first colon and remove everything up to and including it
-                        colon_index = content.find(':')
-                        if colon_index > 0:
-                            content = content[colon_index + 1:].strip()
-                            logger.debug(f"Removed 'Commit Message:' prefix (no space variant)")
-                    
-                    # Handle cases where there's no space after the colon
-                    if ':' in content and len(content) > 10:
-                        # Look for patterns like "fix(scope):description" and add space after colon
-                        colon_index = content.find(':')
-                        if colon_index > 0 and colon_index < len(content) - 1:
-                            after_colon = content[colon_index + 1:]
-                            if after_colon and not after_colon.startswith(' '):
-                                # Add space after colon if missing
-                                content = content[:colon_index + 1] + ' ' + after_colon
-                                logger.debug(f"Added missing space after colon")
-                    
-                    # AGGRESSIVE CLEANUP: Remove ANY response that starts with explanatory text
-                    # This catches patterns we might have missed
-                    content_lower = content.lower()
-                    explanatory_patterns = [
-                        'commit message:', 'commit message', 'message:', 'message ',
-                        'answer:', 'answer ', 'response:', 'response ',
-                        'here is', 'the answer is', 'the response is',
-                        'based on', 'after analyzing', 'looking at',
-                        'i can see', 'i found', 'this change'
-                    ]
-                    
-                    for pattern in explanatory_patterns:
-                        if content_lower.startswith(pattern):
-                            # Find where the actual commit message starts
-                            # Look for the first conventional commit pattern
-                            import re
-                            conventional_pattern = re.compile(r'[a-z]+\([^)]+\):', re.IGNORECASE)
-                            match = conventional_pattern.search(content)
-                            if match:
-                                # Extract from the conventional commit pattern onwards
-                                content = content[match.start():]
-                                logger.debug(f"Aggressively cleaned explanatory text, kept: '{content}'")
-                                break
-                            else:
-                                # If no conventional pattern found, try to find the first colon
-                                colon_index = content.find(':')
-                                if colon_index > 0:
-                                    content = content[colon_index + 1:].strip()
-                                    logger.debug(f"Aggressively cleaned to first colon: '{content}'")
-                                    break
-                    
-                    # Step 3: Remove backticks that some models add around code/commit messages
-                    if content.startswith('`') and content.endswith('`'):
-                        content = content[1:-1].strip()
-                    
-                    # Step 4: Remove any remaining markdown formatting
-                    content = content.replace('**', '').replace('*', '').replace('`', '')
-                    
-                    # Step 5: Clean up extra whitespace and normalize
-                    content = ' '.join(content.split())
-                    
-                    # Step 6: Remove any remaining explanatory text patterns (IMPROVED)
-                    # Only truncate if there's clear evidence of explanatory text after the commit message
-                    if ':' in content:
-                        # Find the first colon (should be the commit message separator)
-                        colon_index = content.find(':')
-                        if colon_index > 0:
-                            # Check if there's a description after the colon
-                            after_colon = content[colon_index + 1:].strip()
-                            if after_colon:
-                                # Only truncate if we detect clear explanatory patterns
-                                # Look for patterns like ". This change..." or ". The..." or ". It..."
-                                explanatory_patterns = ['. This ', '. The ', '. It ', '. A ', '. An ']
-                                should_truncate = False
-                                truncate_at = -1
-                                
-                                for pattern in explanatory_patterns:
-                                    pattern_index = after_colon.find(pattern)
-                                    if pattern_index > 0:
-                                        should_truncate = True
-                                        truncate_at = pattern_index
-                                        break
-                                
-                                if should_truncate:
-                                    # Truncate at the explanatory text
-                                    content = content[:colon_index + 1] + after_colon[:truncate_at]
-                                # Otherwise, keep the full commit message intact
-                    
-                    # Step 7: Final cleanup - ensure we have a proper conventional commit format
-                    # Remove any lines that don't look like commit messages
-                    lines = content.split('\n')
-                    clean_lines = []
-                    for line in lines:
-                        line = line.strip()
-                        if line and ':' in line and len(line) > 10:
-                            clean_lines.append(line)
-                    
-                    if clean_lines:
-                        content = clean_lines[0]  # Take the first valid line
-                    
-                    # Log the cleanup process for debugging
-                    if content != original_content:
-                        logger.debug(f"Cleaned content from '{original_content}' to '{content}'")
-                    
-                    logger.debug(f"Final extracted content: '{content}' (length: {len(content)})")
-                    
-                    # Validate response quality
-                    if not content:
-                        logger.error(f"❌ Empty content from llama.cpp response: {data}")
-                        raise ValueError("Empty response from llama.cpp")
-                    
-                    # Check if response is too short (likely incomplete)
-                    if len(content) < 10:
-                        logger.warning(f"❌ Response too short, likely incomplete: '{content}'")
-                        raise ValueError("Response too short, likely incomplete")
-                    
-                    # Fix spacing issues before validation
-                    content = self._fix_commit_message_spacing(content)
-                    
-                    # Check if response looks like a commit message
-                    validation_start = time.time()
-                    logger.info(f"🔍 VALIDATING RESPONSE FOR: {content[:50]}...")
-                    
-                    if not self._looks_like_commit_message(content):
-                        logger.error(f"❌ VALIDATION FAILED: '{content}'")
-                        logger.error(f"❌ Response doesn't look like a commit message")
-                        raise ValidationError("Response validation failed - using fallback")
-                    
-                    validation_time = time.time() - validation_start
-                    logger.info(f"✅ VALIDATION PASSED: '{content}'")
-                    
-                    # Extract token usage if available
-                    usage = data.get("usage", {})
-                    tokens_used = usage.get("total_tokens")
-                    
-                    # Create response object
-                    ai_response = AIResponse(
-                        content=content,
-                        model=self.model,
-                        tokens_used=tokens_used,
-                        backend_type=self.backend_type
-                    )
-                    
-                    total_time = time.time() - start_time
-                    api_time = time.time() - api_start
-                    
-                    logger.info(f"✅ AI Response generated in {total_time:.2f}s (format: {format_time:.3f}s, API: {api_time:.2f}s, validation: {validation_time:.3f}s)")
-                    
-                    return ai_response
-                    
-            except ValidationError:
-                # Re-raise validation errors without logging them as errors
-                raise
-            except aiohttp.ClientError as e:
-                logger.error(f"llama.cpp API error: {e}")
-                raise
-            except asyncio.TimeoutError:
-                logger.error(f"llama.cpp API timeout after {request_timeout}s")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error in llama.cpp call_api: {e}")
-                raise
+                
+                # Debug logging for response (only visible with --debug)
+                logger.opt(lazy=True).debug("Raw llama.cpp response: {}", lambda: data)
+                
+                if not chunks:
+                    logger.error(f"No choices in llama.cpp response: {data}")
+                    raise ValueError("No choices in llama.cpp response")
+                
+                content = self._clean_response("".join(chunks))
+                
+                # Validate response quality
+                if not content:
+                    logger.error(f"❌ Empty content from llama.cpp response: {data}")
+                    raise ValueError("Empty response from llama.cpp")
+                
+                # Check if response is too short (likely incomplete)
+                if len(content) < 10:
+                    logger.warning(f"❌ Response too short, likely incomplete: '{content}'")
+                    raise ValueError("Response too short, likely incomplete")
+                
+                # Fix spacing issues before validation
+                content = self._fix_commit_message_spacing(content)
+                
+                # Check if response looks like a commit message
+                validation_start = time.time()
+                logger.info(f"🔍 VALIDATING RESPONSE FOR: {content[:50]}...")
+                
+                if not self._looks_like_commit_message(content):
+                    logger.error(f"❌ VALIDATION FAILED: '{content}'")
+                    logger.error(f"❌ Response doesn't look like a commit message")
+                    raise ValidationError("Response validation failed - using fallback")
+                
+                validation_time = time.time() - validation_start
+                logger.info(f"✅ VALIDATION PASSED: '{content}'")
+                
+                # Extract token usage if available
+                usage = data.get("usage", {})
+                tokens_used = usage.get("total_tokens")
+                
+                # Create response object
+                ai_response = AIResponse(
+                    content=content,
+                    model=self.model,
+                    tokens_used=tokens_used,
+                    backend_type=self.backend_type
+                )
+                
+                total_time = time.time() - start_time
+                api_time = time.time() - api_start
+                
+                logger.info(f"✅ AI Response generated in {total_time:.2f}s (format: {format_time:.3f}s, API: {api_time:.2f}s, validation: {validation_time:.3f}s)")
+                
+                return ai_response
+                
+        except ValidationError:
+            # Re-raise validation errors without logging them as errors
+            raise
+        except aiohttp.ClientError as e:
+            logger.error(f"llama.cpp API error: {e}")
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"llama.cpp API timeout after {request_timeout}s")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in llama.cpp call_api: {e}")
+            raise
+    
+    def _clean_response(self, content: str) -> str:
+        """Clean up common AI formatting issues in a raw completion."""
+        content = content.strip()
+        
+        # Clean up common AI formatting issues progressively
+        original_content = content
+        
+        # Step 1: Remove markdown code blocks with language specifiers
+        if content.startswith('```commit'):
+            content = content[8:].strip()
+        elif content.startswith('```') and content.endswith('```'):
+            content = content[3:-3].strip()
+        
+        # Step 2: Remove explanatory prefixes (e.g., "**Correct**:", "Answer:", etc.)
+        prefixes_to_remove = [
+            '**Correct**:', '**Answer**:', '**Response**:', '**Commit**:',
+            'Correct:', 'Answer:', 'Response:', 'Commit:', 'Message:',
+            'Here is the commit message:', 'The commit message is:',
+            'Commit Message:', 'Commit message:', 'commit message:',
+            'The answer is:', 'The response is:', 'Here is the answer:',
+            'Here is the response:', 'Here is what I found:',
+            'Based on the changes:', 'After analyzing the code:',
+            'I can see that:', 'Looking at the diff:'
+        ]
+        
+        # More aggressive cleanup - look for patterns that start with explanatory text
+        content_lower = content.lower()
+        for prefix in prefixes_to_remove:
+            prefix_lower = prefix.lower()
+            if content_lower.startswith(prefix_lower):
+                content = content[len(prefix):].strip()
+                logger.debug(f"Removed prefix '{prefix}' from response")
+                break
+        
+        # Additional cleanup for variations like "Commit Message:fix(...)" (no space)
+        if content_lower.startswith('commit message:'):
+            # Find the first colon and remove everything up to and including it
+            colon_index = content.find(':')
+            if colon_index > 0:
+                content = content[colon_index + 1:].strip()
+                logger.debug(f"Removed 'Commit Message:' prefix (no space variant)")
+        
+        # AGGRESSIVE CLEANUP: Remove ANY response that starts with explanatory text
+        # This catches patterns we might have missed
+        content_lower = content.lower()
+        explanatory_patterns = [
+            'commit message:', 'commit message', 'message:', 'message ',
+            'answer:', 'answer ', 'response:', 'response ',
+            'here is', 'the answer is', 'the response is',
+            'based on', 'after analyzing', 'looking at',
+            'i can see', 'i found', 'this change'
+        ]
+        
+        for pattern in explanatory_patterns:
+            if content_lower.startswith(pattern):
+                # Find where the actual commit message starts
+                # Look for the first conventional commit pattern
+                match = _CONVENTIONAL_RE.search(content)
+                if match:
+                    # Extract from the conventional commit pattern onwards
+                    content = content[match.start():]
+                    logger.debug("Aggressively cleaned explanatory text, kept: '{}'", content)
+                    break
+                else:
+                    # If no conventional pattern found, try to find the first colon
+                    colon_index = content.find(':')
+                    if colon_index > 0:
+                        content = content[colon_index + 1:].strip()
+                        logger.debug("Aggressively cleaned to first colon: '{}'", content)
+                        break
+        
+        # Step 3: Remove backticks that some models add around code/commit messages
+        if content.startswith('`') and content.endswith('`'):
+            content = content[1:-1].strip()
+        
+        # Step 4: Remove any remaining markdown formatting
+        content = content.replace('**', '').replace('*', '').replace('`', '')
+        
+        # Step 5: Clean up extra whitespace and normalize
+        content = ' '.join(content.split())
+        
+        # Step 6: Normalize the text after the first colon (the commit message
+        # separator) in a single pass: ensure one space after it and only
+        # truncate when there's clear evidence of explanatory text
+        # (e.g. ". This change...", ". The...", ". It...")
+        colon_index = content.find(':')
+        if colon_index > 0:
+            head = content[:colon_index + 1]
+            tail = content[colon_index + 1:].lstrip()
+            if tail:
+                for pattern in ('. This ', '. The ', '. It ', '. A ', '. An '):
+                    pattern_index = tail.find(pattern)
+                    if pattern_index > 0:
+                        tail = tail[:pattern_index]
+                        break
+                content = f"{head} {tail}"
+        
+        # Step 7: Final cleanup - ensure we have a proper conventional commit format
+        # Remove any lines that don't look like commit messages
+        lines = content.split('\n')
+        clean_lines = []
+        for line in lines:
+            line = line.strip()
+            if line and ':' in line and len(line) > 10:
+                clean_lines.append(line)
+        
+        if clean_lines:
+            content = clean_lines[0]  # Take the first valid line
+        
+        # Log the cleanup process for debugging
+        if content != original_content:
+            logger.opt(lazy=True).debug(
+                "Cleaned content from '{}' to '{}'", lambda: original_content, lambda: content
+            )
+        
+        logger.opt(lazy=True).debug(
+            "Final extracted content: '{}' (length: {})", lambda: content, lambda: len(content)
+        )
+        
+        return content
     
     def _looks_like_commit_message(self, content: str) -> bool:
         """Check if the response looks like a valid commit message."""
@@ -461,30 +491,18 @@ Output the commit message directly, for example: feat(scope): description
             return True
         
         # Allow semantic variations (e.g., 'ui' vs 'components')
-        semantic_mappings = {
-            'docs': ['docs', 'documentation', 'readme', 'claude'],
-            'ui': ['ui', 'components', 'frontend', 'react'],
-            'api': ['api', 'backend', 'server', 'routes'],
-            'core': ['core', 'main', 'app', 'smart_commit'],
-            'utils': ['utils', 'utilities', 'helpers', 'common']
-        }
-        
-        for expected, variations in semantic_mappings.items():
-            if expected_scope in variations and actual_scope in variations:
-                return True
-        
-        # If no semantic match, require exact match
-        return False
+        canonical = _SCOPE_CANON.get(actual_scope)
+        return canonical is not None and canonical == _SCOPE_CANON.get(expected_scope)
     
     async def health_check(self) -> bool:
         """Check if llama.cpp server is healthy."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_url}/health",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            async with session.get(
+                f"{self.api_url}/health",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                return response.status == 200
         except Exception as e:
             logger.debug(f"llama.cpp health check failed: {e}")
             return False
@@ -492,20 +510,20 @@ Output the commit message directly, for example: feat(scope): description
     async def list_models(self) -> list[str]:
         """List available llama.cpp models."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_url}/v1/models",
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    models = []
-                    for model in data.get("data", []):
-                        models.append(model.get("id", ""))
-                    
-                    return [m for m in models if m]
-                    
+            session = await self._get_session()
+            async with session.get(
+                f"{self.api_url}/v1/models",
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+                
+                models = []
+                for model in data.get("data", []):
+                    models.append(model.get("id", ""))
+                
+                return [m for m in models if m]
+                
         except Exception as e:
             logger.debug(f"Failed to list llama.cpp models: {e}")
             return []
@@ -526,17 +544,22 @@ Output the commit message directly, for example: feat(scope): description
     async def get_server_info(self) -> Dict[str, Any]:
         """Get detailed server information."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_url}/props",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self._get_session()
+            async with session.get(
+                f"{self.api_url}/props",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
         except Exception as e:
             logger.debug(f"Failed to get llama.cpp server info: {e}")
         
         return {}
+    
+    async def parallel_slots(self) -> Optional[int]:
+        """Get the number of parallel slots the llama.cpp server was started with."""
+        slots = (await self.get_server_info()).get("total_slots")
+        return slots if isinstance(slots, int) and slots > 0 else None
 
     async def test_connection(self) -> Dict[str, Any]:
         """Test connection and response quality."""
@@ -599,39 +622,38 @@ Output the commit message directly, for example: feat(scope): description
             "top_p": 0.1,
             "min_p": 0,
             "stop": ["<|im_end|>", "\n\n", "Example:", "Note:"],
-            "stream": False
+            "stream": False,
+            "cache_prompt": self.prompt_cache
         }
         
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                api_start = time.time()
-                async with session.post(
-                    f"{self.api_url}/completion",
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    api_time = time.time() - api_start
-                    
-                    content = data.get("content", "").strip()
-                    
-                    # Basic validation only - no commit message specific checks
-                    if not content or len(content) < 3:
-                        raise ValueError(f"Response too short: '{content}'")
-                    
-                    total_time = time.time() - start_time
-                    
-                    return AIResponse(
-                        content=content,
-                        model=self.model,
-                        response_time=total_time,
-                        backend_type=self.backend_type,
-                        raw_response=data
-                    )
-                    
+            session = await self._get_session()
+            api_start = time.time()
+            async with session.post(
+                f"{self.api_url}/completion",
+                json=payload,
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+                api_time = time.time() - api_start
+                
+                content = data.get("content", "").strip()
+                
+                # Basic validation only - no commit message specific checks
+                if not content or len(content) < 3:
+                    raise ValueError(f"Response too short: '{content}'")
+                
+                total_time = time.time() - start_time
+                
+                return AIResponse(
+                    content=content,
+                    model=self.model,
+                    response_time=total_time,
+                    backend_type=self.backend_type,
+                    raw_response=data
+                )
+                
         except Exception as e:
             total_time = time.time() - start_time
             logger.error(f"llama.cpp API call failed after {total_time:.2f}s: {e}")
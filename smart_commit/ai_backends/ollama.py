@@ -3,108 +3,265 @@ Ollama AI backend implementation.
 """
 
 import asyncio
+import time
 import aiohttp
-from typing import Dict, Any
+import orjson
+from io import StringIO
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
 from loguru import logger
 
 from .base import AIBackend, AIResponse
 
 
+# Seconds a fetched model list stays valid
+MODELS_CACHE_TTL = 30
+
+# Preferred model order (updated for Ollama migration)
+PREFERRED_MODELS = (
+    "qwen2.5-coder:7b-instruct", "qwen2.5-coder:7b",
+    "qwen2.5:7b-instruct", "qwen2.5:7b",
+    "qwen3:8b", "qwen3:4b",
+    "llama3.2:8b", "llama3.2:3b", "llama3.2:1b"
+)
+
+# Servers that rejected a HEAD health probe; these get a plain GET instead
+_HEAD_UNSUPPORTED: Set[str] = set()
+
+
 class OllamaBackend(AIBackend):
     """Ollama AI backend implementation."""
     
+    supports_embeddings = True
+    
+    def __init__(self, api_url: str, model: str, timeout: int = 120, connection_pool_size: int = 16):
+        """Initialize Ollama backend."""
+        super().__init__(api_url, model, timeout, connection_pool_size)
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+        self._detected_model: Optional[str] = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._payload_prefix: Optional[Tuple[str, bytes]] = None
+    
+    def _build_payload(self, prompt: str) -> bytes:
+        """Serialize a streaming generate request for the given prompt."""
+        # Everything but the prompt is fixed per model, so serialize it once
+        if self._payload_prefix is None or self._payload_prefix[0] != self.model:
+            payload: Dict[str, Any] = {
+                "model": self.model,
+                "stream": True,
+                "options": {
+                    "temperature": 0.1,
+                    "top_p": 0.9,
+                }
+            }
+            if self.prompt_cache:
+                # Keeping the model loaded lets Ollama reuse the shared prompt prefix
+                payload["keep_alive"] = self.keep_alive
+            prefix = orjson.dumps(payload)[:-1] + b',"prompt":'
+            self._payload_prefix = (self.model, prefix)
+        
+        return self._payload_prefix[1] + orjson.dumps(prompt) + b"}"
+    
     async def call_api(self, prompt: str) -> AIResponse:
         """Call the Ollama API."""
         self._log_request(prompt)
         
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.1,
-                "top_p": 0.9,
-            }
-        }
+        buffer = StringIO()
+        data: Dict[str, Any] = {}
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{self.api_url}/api/generate",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    return AIResponse(
-                        content=data.get("response", ""),
-                        model=self.model,
-                        backend_type=self.backend_type,
-                        raw_response=data
-                    )
-                    
-            except aiohttp.ClientError as e:
-                logger.error(f"Ollama API error: {e}")
-                raise
-            except asyncio.TimeoutError:
-                logger.error(f"Ollama API timeout after {self.timeout}s")
-                raise
+        try:
+            async for chunk in self._stream_chunks(prompt):
+                buffer.write(chunk.get("response", ""))
+                data = chunk
+        except aiohttp.ClientError as e:
+            logger.error(f"Ollama API error: {e}")
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Ollama API timeout after {self.timeout}s")
+            raise
+        
+        return AIResponse(
+            content=buffer.getvalue(),
+            model=self.model,
+            backend_type=self.backend_type,
+            raw_response=data
+        )
+    
+    async def stream_generate(self, prompt: str) -> AsyncIterator[str]:
+        """Yield generated text from Ollama as it arrives."""
+        async for chunk in self._stream_chunks(prompt):
+            text = chunk.get("response")
+            if text:
+                yield text
+    
+    async def _stream_chunks(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the decoded JSON lines of a streaming generate request."""
+        session = await self._get_session()
+        async with session.post(
+            f"{self.api_url}/api/generate",
+            data=self._build_payload(prompt),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            response.raise_for_status()
+            
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                
+                chunk = orjson.loads(line)
+                if "error" in chunk:
+                    raise ValueError(f"Ollama error: {chunk['error']}")
+                
+                yield chunk
+                
+                if chunk.get("done"):
+                    break
+    
+    async def warmup(self) -> None:
+        """Ask Ollama to load the model so the first prompt skips the load time."""
+        try:
+            session = await self._get_session()
+            # A generate request without a prompt only loads the model into memory
+            async with session.post(
+                f"{self.api_url}/api/generate",
+                data=orjson.dumps({"model": self.model}),
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                await response.read()
+        except Exception as e:
+            logger.debug(f"Ollama warmup failed: {e}")
+    
+    async def embed(self, text: str) -> List[float]:
+        """Get an embedding vector for text from Ollama."""
+        session = await self._get_session()
+        async with session.post(
+            f"{self.api_url}/api/embeddings",
+            data=orjson.dumps({"model": self.embedding_model, "prompt": text}),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            response.raise_for_status()
+            data = orjson.loads(await response.read())
+        
+        embedding = data.get("embedding")
+        if not embedding:
+            raise ValueError(f"No embedding returned by model {self.embedding_model}")
+        return embedding
     
     async def health_check(self) -> bool:
         """Check if Ollama is healthy."""
+        url = f"{self.api_url}/api/tags"
+        probe_timeout = aiohttp.ClientTimeout(total=2)
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            
+            # HEAD avoids downloading the model list just to see if the server is up
+            if self.api_url not in _HEAD_UNSUPPORTED:
+                async with session.head(url, timeout=probe_timeout) as response:
+                    if response.status not in (404, 405, 501):
+                        return response.status == 200
+                
+                logger.debug(f"HEAD not supported by {self.api_url}, falling back to GET")
+                _HEAD_UNSUPPORTED.add(self.api_url)
+            
+            async with session.get(url, timeout=probe_timeout) as response:
+                return response.status == 200
         except Exception as e:
             logger.debug(f"Ollama health check failed: {e}")
             return False
     
     async def list_models(self) -> list[str]:
         """List available Ollama models."""
+        if self._models_cache is not None:
+            cached_at, cached_models = self._models_cache
+            if time.monotonic() - cached_at < MODELS_CACHE_TTL:
+                self._cache_hits += 1
+                return list(cached_models)
+        
+        self._cache_misses += 1
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    models = []
-                    for model in data.get("models", []):
-                        models.append(model.get("name", ""))
-                    
-                    return [m for m in models if m]
-                    
+            session = await self._get_session()
+            async with session.get(
+                f"{self.api_url}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+                
+                models = []
+                for model in data.get("models", []):
+                    models.append(model.get("name", ""))
+                
+                models = [m for m in models if m]
+                self._models_cache = (time.monotonic(), models)
+                return list(models)
+                
         except Exception as e:
             logger.error(f"Failed to list Ollama models: {e}")
             return []
     
     async def auto_detect_model(self) -> str:
         """Auto-detect the best available model."""
+        if self._detected_model is not None:
+            self._cache_hits += 1
+            return self._detected_model
+        
+        detected = await self._detect_model()
+        
+        # Only remember the choice if the model list was actually fetched
+        if self._models_cache is not None:
+            self._detected_model = detected
+        return detected
+    
+    async def _detect_model(self) -> str:
+        """Pick the best model from the server's model list."""
         models = await self.list_models()
         
-        # Preferred model order (updated for Ollama migration)
-        preferred = [
-            "qwen2.5-coder:7b-instruct", "qwen2.5-coder:7b", 
-            "qwen2.5:7b-instruct", "qwen2.5:7b",
-            "qwen3:8b", "qwen3:4b",
-            "llama3.2:8b", "llama3.2:3b", "llama3.2:1b"
-        ]
+        if not models:
+            logger.warning("No Ollama models found, using default")
+            return "qwen2.5-coder:7b-instruct"
+        
+        # Map each tagged variant's shorter tags ("qwen3:8b-q4_K_M" -> "qwen3:8b")
+        # back to the first installed name carrying them
+        installed = set(models)
+        variants: Dict[str, str] = {}
+        for name in models:
+            base, sep, tag = name.partition(":")
+            parts = tag.split("-")
+            for i in range(1, len(parts)):
+                variants.setdefault(f"{base}{sep}{'-'.join(parts[:i])}", name)
         
-        for model in preferred:
-            if any(model in m for m in models):
-                logger.info(f"Auto-detected Ollama model: {model}")
-                return model
+        # One pass in preference order: exact name, then a tagged variant
+        for model in PREFERRED_MODELS:
+            name = model if model in installed else variants.get(model)
+            if name is not None:
+                logger.info(f"Auto-detected Ollama model: {name}")
+                return name
         
-        if models:
-            logger.info(f"Using first available model: {models[0]}")
-            return models[0]
+        # Namespaced installs such as "user/qwen2.5-coder:7b" only match by substring
+        for model in PREFERRED_MODELS:
+            for name in models:
+                if model in name:
+                    logger.info(f"Auto-detected Ollama model: {name}")
+                    return name
         
-        logger.warning("No Ollama models found, using default")
-        return "qwen2.5-coder:7b-instruct"
\ No newline at end of file
+        logger.info(f"Using first available model: {models[0]}")
+        return models[0]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get model list cache statistics."""
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "cache_size": int(self._models_cache is not None) + int(self._detected_model is not None),
+            "max_size": 2,
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0
+        }
+    
+    def clear_scope_cache(self) -> None:
+        """Clear cached model list and detected model."""
+        self._models_cache = None
+        self._detected_model = None
+        self._cache_hits = 0
+        self._cache_misses = 0
@@ -7,13 +7,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 import typer
-from rich.console import Console
 from loguru import logger
 
-from .core import SmartCommit, SmartCommitError
-from .config.settings import Settings
-from .ai_backends.factory import BackendFactory
-
 
 # Create Typer app
 app = typer.Typer(
@@ -24,8 +19,26 @@ app = typer.Typer(
     no_args_is_help=False  # Allow default command
 )
 
-# Global console for error handling
-console = Console()
+# Global console for error handling, created on first use
+_console = None
+
+
+def _get_console():
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def _run(coro):
+    """Run a command coroutine, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
 
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None):
@@ -79,6 +92,10 @@ def main_callback(
         False, "--force-main", "-fm",
         help="Force commit to main branch without protection prompt"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache",
+        help="Always query the AI backend instead of reusing cached messages"
+    ),
     config_file: Optional[Path] = typer.Option(
         None, "--config", "-c",
         help="Path to configuration file"
@@ -112,6 +129,7 @@ def main_callback(
     [green]smart-commit --switch-branch develop[/green]   # Switch to branch and commit
     [green]smart-commit --force-main[/green]              # Force commit to main (bypass protection)
     [green]smart-commit --no-push[/green]                 # Create commits without pushing
+    [green]smart-commit --no-cache[/green]                # Ignore cached AI messages
     [green]smart-commit --verbose[/green]                 # Verbose logging
     [green]smart-commit --debug[/green]                   # Full debug logging
     [green]smart-commit config --show[/green]             # Show configuration
@@ -128,16 +146,16 @@ def main_callback(
     """
     if version:
         from . import __version__
-        console.print(f"[bold blue]Smart Commit[/bold blue] version [green]{__version__}[/green]")
+        _get_console().print(f"[bold blue]Smart Commit[/bold blue] version [green]{__version__}[/green]")
         return
     
     # If no subcommand was called, run the default commit workflow
     if ctx.invoked_subcommand is None:
         # Atomic is now default (inverted from old logic)
         atomic_mode = not non_atomic
-        asyncio.run(_run_commit(
+        _run(_run_commit(
             dry_run, atomic_mode, no_push, new_branch, switch_branch, force_main,
-            config_file, verbose, debug, repo_path
+            no_cache, config_file, verbose, debug, repo_path
         ))
 
 
@@ -173,64 +191,19 @@ def config(
     [green]smart-commit config --backend ollama --save[/green]                  # Set backend to Ollama
     [green]smart-commit config --url http://localhost:8080 --backend llamacpp[/green] # Configure llama.cpp
     """
-    asyncio.run(_run_config(show, backend_type, api_url, model, save))
+    _run(_run_config(show, backend_type, api_url, model, save))
 
 
 @app.command()
 def cache_stats():
     """Show scope cache performance statistics."""
-    try:
-        from smart_commit.core import SmartCommit
-        import asyncio
-        
-        async def show_cache_stats():
-            smart_commit = SmartCommit()
-            await smart_commit.initialize()
-            
-            if hasattr(smart_commit.ai_backend, 'get_cache_stats'):
-                stats = smart_commit.ai_backend.get_cache_stats()
-                
-                console.print("\n[bold blue]Scope Cache Statistics[/bold blue]")
-                console.print(f"Cache Size: {stats['cache_size']}")
-                console.print(f"Max Size: {stats['max_size']}")
-                console.print(f"Cache Hits: {stats['cache_hits']}")
-                console.print(f"Cache Misses: {stats['cache_misses']}")
-                console.print(f"Hit Rate: {stats['hit_rate']:.1%}")
-                
-                if stats['cache_hits'] > 0:
-                    console.print(f"\n[green]Performance: Cache is working efficiently![/green]")
-                else:
-                    console.print(f"\n[yellow]Performance: Cache is still warming up...[/yellow]")
-            else:
-                console.print("[yellow]Cache statistics not available for this backend[/yellow]")
-        
-        asyncio.run(show_cache_stats())
-        
-    except Exception as e:
-        console.print(f"[red]Error getting cache stats: {e}[/red]")
+    _run(_run_cache_stats())
 
 
 @app.command()
 def clear_cache():
-    """Clear the scope cache."""
-    try:
-        from smart_commit.core import SmartCommit
-        import asyncio
-        
-        async def clear_scope_cache():
-            smart_commit = SmartCommit()
-            await smart_commit.initialize()
-            
-            if hasattr(smart_commit.ai_backend, 'clear_scope_cache'):
-                smart_commit.ai_backend.clear_scope_cache()
-                console.print("[green]Scope cache cleared successfully![/green]")
-            else:
-                console.print("[yellow]Cache clearing not available for this backend[/yellow]")
-        
-        asyncio.run(clear_scope_cache())
-        
-    except Exception as e:
-        console.print(f"[red]Error clearing cache: {e}[/red]")
+    """Clear the scope cache and cached AI messages."""
+    _run(_run_clear_cache())
 
 
 @app.command()
@@ -253,7 +226,7 @@ def test(
     [green]smart-commit test --backend ollama[/green]     # Test Ollama specifically  
     [green]smart-commit test --all[/green]                # Test all backends
     """
-    asyncio.run(_run_test(backend, all_backends))
+    _run(_run_test(backend, all_backends))
 
 
 
@@ -265,18 +238,21 @@ async def _run_commit(
     new_branch: bool,
     switch_branch: Optional[str],
     force_main: bool,
+    no_cache: bool,
     config_file: Optional[Path],
     verbose: bool,
     debug: bool,
     repo_path: Optional[Path]
 ):
     """Run commit command."""
+    from .core import SmartCommit, SmartCommitError
+    from .config.settings import get_settings
+    
+    console = _get_console()
+    smart_commit = None
     try:
         # Load settings
-        if config_file:
-            settings = Settings.from_file(config_file)
-        else:
-            settings = Settings()
+        settings = get_settings(config_file)
         
         # Setup logging - debug overrides verbose
         if debug:
@@ -287,6 +263,14 @@ async def _run_commit(
             log_level = settings.ui.log_level
         setup_logging(log_level, settings.log_file)
         
+        # Flag overrides go to a copy; the loaded settings are shared for the whole process
+        if no_cache or no_push:
+            settings = settings.model_copy(deep=True)
+        
+        # Bypass the AI result cache if --no-cache flag is used
+        if no_cache:
+            settings.performance.cache_ttl = 0
+        
         # Create and initialize Smart Commit
         smart_commit = SmartCommit(settings, repo_path)
         smart_commit.console.print_banner()
@@ -330,6 +314,10 @@ async def _run_commit(
         logger.exception("Unexpected error occurred")
         console.print(f"[red]Unexpected error:[/red] {e}")
         raise typer.Exit(1)
+    finally:
+        # Release pooled AI backend connections
+        if smart_commit:
+            await smart_commit.aclose()
 
 
 async def _run_config(
@@ -340,8 +328,12 @@ async def _run_config(
     save: bool
 ):
     """Run config command."""
+    from .core import SmartCommit
+    from .config.settings import get_settings
+    
+    console = _get_console()
     try:
-        settings = Settings()
+        settings = get_settings()
         
         # Show current configuration
         if show:
@@ -390,8 +382,14 @@ async def _run_config(
 
 async def _run_test(backend: Optional[str], all_backends: bool):
     """Run test command."""
+    from .core import SmartCommit
+    from .config.settings import get_settings
+    from .ai_backends.factory import BackendFactory
+    
+    console = _get_console()
+    smart_commit = None
     try:
-        settings = Settings()
+        settings = get_settings()
         
         if all_backends:
             # Test all backend types
@@ -410,7 +408,7 @@ async def _run_test(backend: Optional[str], all_backends: bool):
                 raise typer.Exit(1)
             
             # Temporarily override backend type
-            test_settings = Settings()
+            test_settings = settings.model_copy(deep=True)
             test_settings.ai.backend_type = backend
             
             smart_commit = SmartCommit(test_settings)
@@ -452,14 +450,79 @@ async def _run_test(backend: Optional[str], all_backends: bool):
     except Exception as e:
         console.print(f"[red]Test failed:[/red] {e}")
         raise typer.Exit(1)
+    finally:
+        if smart_commit:
+            await smart_commit.aclose()
+
+
+async def _run_cache_stats():
+    """Run cache-stats command."""
+    from .core import SmartCommit
+    
+    console = _get_console()
+    try:
+        async with SmartCommit() as smart_commit:
+            await smart_commit.initialize()
+            
+            if hasattr(smart_commit.ai_backend, 'get_cache_stats'):
+                stats = smart_commit.ai_backend.get_cache_stats()
+                
+                console.print("\n[bold blue]Scope Cache Statistics[/bold blue]")
+                console.print(f"Cache Size: {stats['cache_size']}")
+                console.print(f"Max Size: {stats['max_size']}")
+                console.print(f"Cache Hits: {stats['cache_hits']}")
+                console.print(f"Cache Misses: {stats['cache_misses']}")
+                console.print(f"Hit Rate: {stats['hit_rate']:.1%}")
+                
+                if stats['cache_hits'] > 0:
+                    console.print("\n[green]Performance: Cache is working efficiently![/green]")
+                else:
+                    console.print("\n[yellow]Performance: Cache is still warming up...[/yellow]")
+            else:
+                console.print("[yellow]Cache statistics not available for this backend[/yellow]")
+        
+    except Exception as e:
+        console.print(f"[red]Error getting cache stats: {e}[/red]")
+
+
+async def _run_clear_cache():
+    """Run clear-cache command."""
+    from .core import SmartCommit
+    
+    console = _get_console()
+    try:
+        async with SmartCommit() as smart_commit:
+            await smart_commit.initialize()
+            
+            if hasattr(smart_commit.ai_backend, 'clear_scope_cache'):
+                smart_commit.ai_backend.clear_scope_cache()
+                console.print("[green]Scope cache cleared successfully![/green]")
+            else:
+                console.print("[yellow]Cache clearing not available for this backend[/yellow]")
+            
+            if smart_commit.llm_cache:
+                smart_commit.llm_cache.clear()
+                console.print("[green]AI message cache cleared successfully![/green]")
+            
+            if smart_commit.semantic_cache:
+                smart_commit.semantic_cache.clear()
+        
+    except Exception as e:
+        console.print(f"[red]Error clearing cache: {e}[/red]")
 
 
 def main():
     """Main entry point for the CLI."""
+    # Answer a bare --version without Click dispatch or a Rich console
+    if sys.argv[1:] == ["--version"]:
+        from . import __version__
+        print(f"Smart Commit version {__version__}")
+        return
+    
     try:
         app()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Interrupted by user[/yellow]")
+        _get_console().print("\n[yellow]Interrupted by user[/yellow]")
         sys.exit(130)
 
 
@@ -2,14 +2,47 @@
 Configuration management with Pydantic validation and environment variable support.
 """
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Any, Dict, Optional, Literal, Tuple
+import orjson
 from pydantic import BaseModel, Field, field_validator, AliasChoices
 from pydantic_settings import BaseSettings
 import platform
 
 
+# Resolve the platform and base directories once at import
+_SYSTEM = platform.system()
+if _SYSTEM == "Windows":
+    _CONFIG_BASE = Path(os.environ.get("APPDATA", "~")).expanduser()
+    _CACHE_BASE = Path(os.environ.get("LOCALAPPDATA", "~")).expanduser()
+else:
+    _CONFIG_BASE = Path(os.environ.get("XDG_CONFIG_HOME", "~/.config")).expanduser()
+    _CACHE_BASE = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+
+# AI settings overridable from the environment: (field, variables in priority order, converter)
+_ENV_MAP = (
+    ("api_url", ("AI_API_URL", "OLLAMA_API_URL"), str),
+    ("model", ("AI_MODEL", "OLLAMA_MODEL"), str),
+    ("backend_type", ("AI_BACKEND_TYPE",), str),
+    ("timeout", ("AI_TIMEOUT",), int),
+)
+
+# Parsed config files keyed by (path, mtime_ns)
+_config_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+
+def _load_config_file(config_path: Path) -> Dict[str, Any]:
+    """Parse a JSON config file, reusing the result while the file is unchanged."""
+    key = (str(config_path), os.stat(config_path).st_mtime_ns)
+    if key not in _config_cache:
+        _config_cache[key] = orjson.loads(config_path.read_bytes())
+    # Callers mutate the dict (env overrides), so hand out a copy
+    return copy.deepcopy(_config_cache[key])
+
+
 class AISettings(BaseModel):
     """AI backend configuration."""
     
@@ -37,6 +70,40 @@ class AISettings(BaseModel):
         le=10,
         description="Maximum number of API retries"
     )
+    connection_pool_size: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Maximum pooled connections per AI server host"
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=64,
+        description="Maximum concurrent AI requests in atomic mode; defaults to the server's parallel slots"
+    )
+    supports_batching: bool = Field(
+        default=False,
+        description="Ask for all atomic commit messages in a single JSON request"
+    )
+    batch_size: int = Field(
+        default=16,
+        ge=2,
+        le=64,
+        description="Maximum files per batched atomic request"
+    )
+    embedding_model: str = Field(
+        default="nomic-embed-text",
+        description="Embedding model used by the semantic message cache"
+    )
+    prompt_cache: bool = Field(
+        default=True,
+        description="Ask the server to reuse cached state for identical prompt prefixes"
+    )
+    keep_alive: str = Field(
+        default="10m",
+        description="How long Ollama keeps the model loaded between requests"
+    )
 
 
 class GitSettings(BaseModel):
@@ -87,6 +154,12 @@ class UISettings(BaseModel):
         default=True,
         description="Enable interactive prompts"
     )
+    animation_delay: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=2.0,
+        description="Seconds to pause after spinner steps in interactive mode (0 disables)"
+    )
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(
         default="INFO",
         description="Logging level"
@@ -110,12 +183,30 @@ class PerformanceSettings(BaseModel):
         le=300,       # Increased max limit to 300 characters
         description="Maximum commit message character limit"
     )
+    cache_ttl: int = Field(
+        default=86400,
+        ge=0,
+        le=2592000,
+        description="Seconds to reuse AI results for identical prompts (0 disables the cache)"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Cosine similarity for reusing messages of near-identical diffs to the same file (0 disables)"
+    )
+    health_check_ttl: int = Field(
+        default=60,
+        ge=0,
+        le=3600,
+        description="Seconds to trust the last successful backend health check (0 checks every run)"
+    )
     
     @field_validator('macos_local_mode', mode='before')
     @classmethod
     def detect_macos_local(cls, v):
         """Auto-detect macOS local mode."""
-        if platform.system() == "Darwin":
+        if _SYSTEM == "Darwin":
             # Check if we're likely using local Ollama
             return os.getenv('SMART_COMMIT_MACOS_LOCAL', 'false').lower() == 'true'
         return v
@@ -141,90 +232,53 @@ class Settings(BaseSettings):
         # First, try to load from default config file if no explicit config provided
         if not kwargs and not any(os.getenv(var) for var in ["AI_API_URL", "OLLAMA_API_URL", "AI_MODEL", "OLLAMA_MODEL"]):
             config_path = self._get_default_config_path()
-            if config_path.exists():
-                import json
-                try:
-                    with open(config_path) as f:
-                        config_data = json.load(f)
-                    kwargs = config_data
-                except (json.JSONDecodeError, OSError):
-                    pass  # Fall back to defaults
+            try:
+                kwargs = _load_config_file(config_path)
+            except (orjson.JSONDecodeError, OSError):
+                pass  # Missing or unreadable file: fall back to defaults
         
         # Handle environment variables manually for nested fields
-        env_overrides = {}
-        
-        # Check for AI environment variables
-        if os.getenv("AI_API_URL") or os.getenv("OLLAMA_API_URL"):
-            if not kwargs.get("ai"):
-                kwargs["ai"] = {}
-            kwargs["ai"]["api_url"] = os.getenv("AI_API_URL") or os.getenv("OLLAMA_API_URL")
-        
-        if os.getenv("AI_MODEL") or os.getenv("OLLAMA_MODEL"):
-            if not kwargs.get("ai"):
-                kwargs["ai"] = {}
-            kwargs["ai"]["model"] = os.getenv("AI_MODEL") or os.getenv("OLLAMA_MODEL")
-        
-        if os.getenv("AI_BACKEND_TYPE"):
+        for field, env_vars, convert in _ENV_MAP:
+            value = next((v for v in map(os.getenv, env_vars) if v), None)
+            if value is None:
+                continue
+            try:
+                converted = convert(value)
+            except (ValueError, TypeError):
+                continue
             if not kwargs.get("ai"):
                 kwargs["ai"] = {}
-            kwargs["ai"]["backend_type"] = os.getenv("AI_BACKEND_TYPE")
+            kwargs["ai"][field] = converted
         
-        if os.getenv("AI_TIMEOUT"):
-            if not kwargs.get("ai"):
-                kwargs["ai"] = {}
-            try:
-                kwargs["ai"]["timeout"] = int(os.getenv("AI_TIMEOUT"))
-            except (ValueError, TypeError):
-                pass
-                
         super().__init__(**kwargs)
     
     def _get_default_config_path(self) -> Path:
         """Get the default config file path."""
-        if platform.system() == "Windows":
-            base = Path(os.environ.get("APPDATA", "~"))
-        else:
-            base = Path(os.environ.get("XDG_CONFIG_HOME", "~/.config"))
-        
-        return (base / "smart-commit" / "config.json").expanduser()
+        return _CONFIG_BASE / "smart-commit" / "config.json"
     
     
     @classmethod
     def from_file(cls, config_path: Path) -> "Settings":
         """Load settings from a configuration file."""
         if config_path.exists():
-            import json
-            with open(config_path) as f:
-                config_data = json.load(f)
+            config_data = _load_config_file(config_path)
             return cls(**config_data)
         return cls()
     
     def save_to_file(self, config_path: Path) -> None:
         """Save current settings to a configuration file."""
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            import json
-            json.dump(self.model_dump(), f, indent=2)
+        config_path.write_bytes(orjson.dumps(self.model_dump(), option=orjson.OPT_INDENT_2))
     
     @property
     def config_dir(self) -> Path:
         """Get the configuration directory."""
-        if platform.system() == "Windows":
-            base = Path(os.environ.get("APPDATA", "~"))
-        else:
-            base = Path(os.environ.get("XDG_CONFIG_HOME", "~/.config"))
-        
-        return (base / "smart-commit").expanduser()
+        return _CONFIG_BASE / "smart-commit"
     
     @property
     def cache_dir(self) -> Path:
         """Get the cache directory."""
-        if platform.system() == "Windows":
-            base = Path(os.environ.get("LOCALAPPDATA", "~"))
-        else:
-            base = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache"))
-        
-        return (base / "smart-commit").expanduser()
+        return _CACHE_BASE / "smart-commit"
     
     @property
     def log_file(self) -> Path:
@@ -232,5 +286,13 @@ class Settings(BaseSettings):
         return self.cache_dir / "smart-commit.log"
 
 
+@lru_cache(maxsize=None)
+def get_settings(config_path: Optional[Path] = None) -> Settings:
+    """Get the process-wide settings, loading them once per config path."""
+    if config_path is not None:
+        return Settings.from_file(config_path)
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -3,27 +3,140 @@ Core Smart Commit engine that orchestrates all components.
 """
 
 import asyncio
+import ipaddress
+import itertools
+import os
+import re
+import stat
 import time
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Awaitable, FrozenSet, NamedTuple, Optional, Set, Tuple
 from pathlib import Path
+from urllib.parse import urlparse
 from loguru import logger
 
-from .config.settings import Settings
-from .git_ops.repository import GitRepository, FileChange, RepositoryState, GitRepositoryError
+from .config.settings import Settings, get_settings
+from .git_ops.repository import GitRepository, FileChange, RepositoryState, ProposedCommit, GitRepositoryError
 from .ai_backends.factory import BackendFactory
 from .ai_backends.base import AIBackend
 from .utils.message_extractor import message_extractor
 from .utils.prompts import PromptBuilder
 from .utils.security import SecurityScanner
+from .utils.llm_cache import DiskCache, SemanticCache
+from .utils.trivial_commit import try_trivial
 from .ui.console import SmartCommitConsole
 
 
+# Fallback messages by change type when no path keyword matches: (scope, file name)
+_GENERIC_FALLBACKS = {
+    "M": "fix({}): update {}",
+    "A": "feat({}): add {}",
+    "D": "chore({}): remove {}",
+}
+
+# Extensions stripped from file names in generic fallback messages
+_FALLBACK_EXTENSION = re.compile(r'\.(?:py|sh|md)$')
+
+# New directories with this many files are summarized without counting the rest
+_DIRECTORY_SCAN_LIMIT = 10_000
+
+# Concurrent AI requests when neither the settings nor the server give a number;
+# requests beyond the server's slots only wait in its queue and run into timeouts
+_DEFAULT_AI_CONCURRENCY = 2
+
+
+def _is_loopback_url(url: str) -> bool:
+    """Check whether a URL points at this machine, so requests to it never leave the host."""
+    host = urlparse(url).hostname or ""
+    if host == "localhost" or host.endswith(".localhost"):
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class NewFileKind(NamedTuple):
+    """Commit type and description for a new file."""
+    
+    type: str
+    description: str
+
+
+# Commit type classifications shared by every new file
+_NEW_FILE_DOCS = NewFileKind('docs', 'documentation')
+_NEW_FILE_SCRIPT = NewFileKind('feat', 'new script/utility')
+_NEW_FILE_CONFIG = NewFileKind('chore', 'configuration')
+_NEW_FILE_DATA = NewFileKind('feat', 'data file')
+_NEW_FILE_OTHER = NewFileKind('feat', 'new file')
+
+# New file classification by lowercased extension; anything else is _NEW_FILE_OTHER
+_NEW_FILE_KINDS = {
+    **dict.fromkeys(('.md', '.txt', '.rst', '.adoc'), _NEW_FILE_DOCS),
+    **dict.fromkeys(('.py', '.sh', '.js', '.ts', '.rb', '.php'), _NEW_FILE_SCRIPT),
+    **dict.fromkeys(('.json', '.yaml', '.yml', '.toml', '.ini', '.cfg'), _NEW_FILE_CONFIG),
+    **dict.fromkeys(('.csv', '.xml', '.sql', '.db'), _NEW_FILE_DATA),
+}
+
+# File type notes appended to the context of new files, by extension
+_NEW_FILE_SUFFIX_LABELS = {
+    ".md": " (documentation)",
+    ".py": " (Python script)",
+    ".sh": " (shell script)",
+}
+
+# Fallback messages by path keyword, checked in order: (keyword, default scope, {change type: message})
+_FALLBACK_RULES = (
+    ("install", "install", {
+        "M": "fix({}): update installation configuration",
+        "A": "feat({}): add new installation feature",
+        "D": "chore({}): remove deprecated installation code",
+    }),
+    ("llamacpp", "ai", {
+        "M": "fix({}): resolve llamacpp backend issues",
+        "A": "feat({}): add new llamacpp functionality",
+    }),
+    ("prompts", "utils", {
+        "M": "refactor({}): improve prompt generation logic",
+        "A": "feat({}): add new prompt templates",
+    }),
+    ("message_extractor", "utils", {
+        "M": "fix({}): resolve message extraction issues",
+        "A": "feat({}): add new message extraction features",
+    }),
+    ("base.py", "ai", {
+        "M": "fix({}): improve backend base functionality",
+        "A": "feat({}): add new backend features",
+    }),
+    ("cli.py", "core", {
+        "M": "fix({}): improve command-line interface",
+        "A": "feat({}): add new CLI options",
+    }),
+    ("core.py", "core", {
+        "M": "fix({}): improve core application logic",
+        "A": "feat({}): add new core functionality",
+    }),
+    ("repository.py", "git", {
+        "M": "fix({}): improve git operations handling",
+        "A": "feat({}): add new git operation features",
+    }),
+    ("console.py", "ui", {
+        "M": "fix({}): improve console output handling",
+        "A": "feat({}): add new console features",
+    }),
+    ("settings.py", "config", {
+        "M": "fix({}): update configuration settings",
+        "A": "feat({}): add new configuration options",
+    }),
+)
+
+
 class SmartCommit:
     """Core Smart Commit application engine."""
     
     def __init__(self, settings: Optional[Settings] = None, repo_path: Optional[Path] = None):
         """Initialize Smart Commit with settings and repository."""
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         self.git_repo = GitRepository(repo_path)
         self.console = SmartCommitConsole(self.settings)
         self.ai_backend: Optional[AIBackend] = None
@@ -33,6 +146,24 @@ class SmartCommit:
             optimized_mode=self.settings.performance.macos_local_mode,
             settings=self.settings
         )
+        self.llm_cache: Optional[DiskCache] = None
+        if self.settings.performance.cache_ttl:
+            self.llm_cache = DiskCache(
+                self.settings.cache_dir / "llm.sqlite",
+                ttl=self.settings.performance.cache_ttl
+            )
+        # Built in initialize() once the backend is known to support embeddings
+        self.semantic_cache: Optional[SemanticCache] = None
+        self._prompt_embeddings: Dict[str, Tuple[str, List[float]]] = {}
+        self._state_cache: Dict[tuple, RepositoryState] = {}
+        self._numstat: Optional[Dict[str, Tuple[int, int]]] = None
+        self._tracked_dirs: Optional[Set[str]] = None
+        self._existing_dirs: Optional[Tuple[str, FrozenSet[str]]] = None
+        # Kept here so an unfinished warmup is cancelled in aclose() rather than left dangling
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Spinner pauses only matter to someone watching a terminal
+        show_animations = self.settings.ui.interactive and self.console.console.is_terminal
+        self._ux_delay = self.settings.ui.animation_delay if show_animations else 0
         
         logger.info("Smart Commit initialized")
     
@@ -51,9 +182,93 @@ class SmartCommit:
         except Exception as e:
             raise SmartCommitError(f"Failed to initialize AI backend: {e}")
         
-        # Test AI backend connection
+        if self.settings.performance.cache_ttl and self.settings.performance.semantic_cache_threshold:
+            if self.ai_backend.supports_embeddings:
+                self.semantic_cache = SemanticCache(
+                    self.settings.cache_dir / "llm.sqlite",
+                    namespace=str(Path(self.git_repo.repo_path).resolve()),
+                    ttl=self.settings.performance.cache_ttl
+                )
+            else:
+                logger.debug(f"{self.ai_backend.backend_type} backend has no embeddings, semantic cache disabled")
+        
+        # Test AI backend connection, unless a recent run already did
+        if self._recently_healthy():
+            logger.debug("Skipping health check, backend was healthy within the last {}s", self.settings.performance.health_check_ttl)
+            return
         if not await self.ai_backend.health_check():
             raise SmartCommitError(f"AI backend health check failed. Check your {self.ai_backend.backend_type} server.")
+        self._record_health(True)
+    
+    def _health_key(self) -> str:
+        """Identify the backend server and model a health check applies to."""
+        return f"{self.ai_backend.backend_type}|{self.ai_backend.api_url}|{self.ai_backend.model}"
+    
+    def _recently_healthy(self) -> bool:
+        """Check whether this backend passed a health check within the configured TTL."""
+        ttl = self.settings.performance.health_check_ttl
+        if not ttl:
+            return False
+        try:
+            records = orjson.loads((self.settings.cache_dir / "health.json").read_bytes())
+            checked_at = float(records[self._health_key()])
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            return False
+        return 0 <= time.time() - checked_at < ttl
+    
+    def _record_health(self, healthy: bool) -> None:
+        """Remember or forget a successful health check for the current backend."""
+        if not self.settings.performance.health_check_ttl:
+            return
+        health_file = self.settings.cache_dir / "health.json"
+        try:
+            records = orjson.loads(health_file.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            records = {}
+        if not isinstance(records, dict):
+            records = {}
+        if healthy:
+            records[self._health_key()] = time.time()
+        elif records.pop(self._health_key(), None) is None:
+            return
+        try:
+            health_file.parent.mkdir(parents=True, exist_ok=True)
+            health_file.write_bytes(orjson.dumps(records))
+        except OSError as e:
+            logger.debug(f"Could not write health check cache: {e}")
+    
+    async def aclose(self) -> None:
+        """Release pooled AI backend connections and close the response caches."""
+        await self._stop_warmup()
+        if self.ai_backend:
+            if self.ai_backend.connection_failed:
+                # Make the next run check the server again
+                self._record_health(False)
+            await self.ai_backend.aclose()
+        if self.llm_cache:
+            self.llm_cache.close()
+        if self.semantic_cache:
+            self.semantic_cache.close()
+    
+    def _start_warmup(self) -> None:
+        """Warm the AI backend in the background while the repository is read."""
+        self._warmup_task = asyncio.create_task(self.ai_backend.warmup())
+    
+    async def _stop_warmup(self) -> None:
+        """Cancel a warmup that is still in flight and wait for it to unwind."""
+        task, self._warmup_task = self._warmup_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    async def __aenter__(self) -> "SmartCommit":
+        """Use Smart Commit as an async context manager that closes its resources on exit."""
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the AI backend session and caches."""
+        await self.aclose()
     
     async def run_traditional_commit(self, dry_run: bool = False, force_branch: bool = False, new_branch: bool = False, switch_to_branch: Optional[str] = None) -> None:
         """Run traditional single commit workflow."""
@@ -66,10 +281,12 @@ class SmartCommit:
                 self.console.print_info("Commit cancelled")
                 return
         
-        # Get repository state
-        repo_state = self.git_repo.get_repository_state(self.settings.git.max_diff_lines)
+        # Get repository state while the backend warms up
+        self._start_warmup()
+        repo_state = await asyncio.to_thread(self._get_repository_state)
         
         if not repo_state.has_changes:
+            await self._stop_warmup()
             self.console.print_warning("No changes detected in repository")
             return
         
@@ -81,33 +298,33 @@ class SmartCommit:
         if self.settings.git.auto_stage and repo_state.unstaged_files:
             if not dry_run:
                 with self.console.show_progress_spinner("Staging changes"):
-                    self.git_repo.stage_files()
-                    await asyncio.sleep(0.5)  # Brief pause for UX
+                    await asyncio.to_thread(self.git_repo.stage_files)
+                    await self._ux_pause()
                 self.console.print_success("Staged all changes")
         
-        # Security scan
+        # Security scan runs while the commit message is generated, but a diff only
+        # goes to a backend on another host once the scan has cleared it
+        scan_task = None
         if not dry_run:
-            with self.console.show_progress_spinner("Running security scan"):
-                staged_files = [change.file_path for change in repo_state.staged_files]
-                scan_result = await self.security_scanner.scan_before_commit(
-                    self.git_repo.repo_path, 
-                    staged_files
-                )
-                await asyncio.sleep(0.3)  # Brief pause for UX
-            
-            self.console.show_security_scan_results(scan_result)
-            
-            if scan_result["should_block_commit"]:
-                if self.settings.ui.interactive:
-                    if not self.console.confirm_action("Secrets detected! Continue with commit anyway?"):
-                        self.console.print_info("Commit cancelled for security")
-                        return
-                else:
-                    self.console.print_error("Commit blocked - secrets detected")
+            staged_files = [change.file_path for change in repo_state.staged_files]
+            scan_task = asyncio.create_task(
+                self.security_scanner.scan_before_commit(Path(self.git_repo.repo_path), staged_files)
+            )
+            if not _is_loopback_url(self.ai_backend.api_url):
+                if not await self._confirm_security_scan(scan_task):
                     return
+                scan_task = None
         
         # Generate commit message
-        commit_message = await self._generate_traditional_commit_message(repo_state)
+        try:
+            commit_message = await self._generate_traditional_commit_message(repo_state)
+        except BaseException:
+            if scan_task:
+                scan_task.cancel()
+            raise
+        
+        if scan_task and not await self._confirm_security_scan(scan_task):
+            return
         
         if not commit_message:
             self.console.print_error("Failed to generate commit message")
@@ -128,8 +345,11 @@ class SmartCommit:
         
         # Create commit
         with self.console.show_progress_spinner("Creating commit"):
-            commit_hash = self.git_repo.commit(commit_message)
-            await asyncio.sleep(0.5)
+            commit_hash = await asyncio.to_thread(self.git_repo.commit, commit_message)
+            self._state_cache.clear()
+            self._numstat = None
+            self._tracked_dirs = None
+            await self._ux_pause()
         
         self.console.print_success(f"Created commit {commit_hash[:8]}")
         
@@ -148,10 +368,12 @@ class SmartCommit:
                 self.console.print_info("Atomic commits cancelled")
                 return
         
-        # Get repository state
-        repo_state = self.git_repo.get_repository_state(self.settings.git.max_diff_lines)
+        # Get repository state while the backend warms up
+        self._start_warmup()
+        repo_state = await asyncio.to_thread(self._get_repository_state)
         
         if not repo_state.has_changes:
+            await self._stop_warmup()
             self.console.print_warning("No changes detected in repository")
             return
         
@@ -171,67 +393,21 @@ class SmartCommit:
         # Add untracked files/directories as top-level units (like bash version)
         top_level_untracked = self._get_top_level_untracked(repo_state.untracked_files)
         
-        for untracked_item in top_level_untracked:
-            # Skip if we've already processed this file
-            if untracked_item in seen_files:
-                continue
-                
-            try:
-                item_path = Path(self.git_repo.repo_path) / untracked_item
-                
-                if item_path.is_file():
-                    # Handle single file
-                    with open(item_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    # Enhanced new file context for better AI understanding
-                    file_type_info = self._analyze_new_file_type(item_path, content)
-                    enhanced_context = self._enhance_new_file_context(untracked_item, repo_state)
-                    
-                    diff_content = f"--- /dev/null\n+++ b/{untracked_item}\n"
-                    diff_content += f"+NEW FILE: {untracked_item}\n"
-                    diff_content += f"+FILE TYPE: {file_type_info['type']}\n"
-                    diff_content += f"+PURPOSE: {file_type_info['description']}\n"
-                    diff_content += f"+CONTEXT: {enhanced_context}\n"
-                    diff_content += f"+CONTENT PREVIEW:\n"
-                    for line in content.splitlines():
-                        diff_content += f"+{line}\n"
-                    
-                    file_change = FileChange(
-                        file_path=untracked_item,
-                        change_type='A',
-                        diff_content=diff_content,
-                        lines_added=len(content.splitlines()),
-                        lines_removed=0
-                    )
-                    files_to_process.append(file_change)
-                    seen_files.add(untracked_item)
-                    
-                elif item_path.is_dir():
-                    # Handle directory as a unit
-                    # Get summary of files in directory
-                    all_files = list(item_path.rglob('*'))
-                    py_files = [f for f in all_files if f.suffix == '.py']
-                    total_files = len([f for f in all_files if f.is_file()])
-                    
-                    # Create summary diff for directory
-                    diff_content = f"--- /dev/null\n+++ b/{untracked_item}/\n"
-                    diff_content += f"+New directory with {total_files} files\n"
-                    if py_files:
-                        diff_content += f"+Python package: {len(py_files)} Python files\n"
-                    
-                    file_change = FileChange(
-                        file_path=untracked_item,
-                        change_type='A',
-                        diff_content=diff_content,
-                        lines_added=total_files,
-                        lines_removed=0
-                    )
-                    files_to_process.append(file_change)
-                    seen_files.add(untracked_item)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to process untracked item {untracked_item}: {e}")
+        pending_untracked = [item for item in top_level_untracked if item not in seen_files]
+        
+        # Describe where every new item fits in one pass, then read them concurrently off the event loop
+        contexts = await asyncio.to_thread(self._enhance_new_files_bulk, pending_untracked)
+        results = await asyncio.gather(
+            *(self._ingest_untracked(item, contexts[item]) for item in pending_untracked),
+            return_exceptions=True
+        )
+        
+        for untracked_item, result in zip(pending_untracked, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to process untracked item {untracked_item}: {result}")
+            elif result is not None:
+                files_to_process.append(result)
+                seen_files.add(untracked_item)
         
         if not files_to_process:
             self.console.print_warning("No files found for atomic commits")
@@ -240,9 +416,21 @@ class SmartCommit:
         self.console.print_file_changes(files_to_process, "Files for Atomic Commits")
         
         # Generate commit messages for all files
+        # One numstat call covers the truncation check of every file
+        self._numstat = await asyncio.to_thread(self.git_repo.get_numstat)
+        
+        # Secret scans do not depend on the messages, so they run while the AI generates
+        secret_scans = None
+        if not dry_run:
+            secret_scans = asyncio.create_task(
+                self._scan_files_for_secrets([file_change.file_path for file_change in files_to_process])
+            )
+        
         proposed_commits = await self._generate_atomic_commit_messages(files_to_process)
         
         if not proposed_commits:
+            if secret_scans:
+                secret_scans.cancel()
             self.console.print_error("Failed to generate commit messages")
             return
         
@@ -250,22 +438,24 @@ class SmartCommit:
         if self.settings.ui.interactive:
             approval = await self._handle_atomic_commits_approval(proposed_commits)
             if not approval:
+                if secret_scans:
+                    secret_scans.cancel()
                 self.console.print_info("Atomic commits cancelled")
                 return
             proposed_commits = approval
         else:
             # Non-interactive mode: show preview
-            self.console.print("\n[bold blue]Proposed Atomic Commits[/bold blue]\n")
+            self.console.console.print("\n[bold blue]Proposed Atomic Commits[/bold blue]\n")
             table = self.console.show_atomic_commits_preview(proposed_commits)
-            self.console.print(table)
-            self.console.print()
+            self.console.console.print(table)
+            self.console.console.print()
         
         if dry_run:
             self.console.print_info("Dry run complete - no commits would be created")
             return
         
         # Create commits
-        created_commits = await self._create_atomic_commits(proposed_commits)
+        created_commits = await self._create_atomic_commits(proposed_commits, secret_scans)
         
         if created_commits:
             self.console.show_commit_summary(created_commits)
@@ -274,13 +464,153 @@ class SmartCommit:
             if self.settings.git.auto_push:
                 await self._push_commits()
     
-    async def _generate_traditional_commit_message(self, repo_state: RepositoryState) -> str:
-        """Generate a commit message for traditional (multi-file) commits."""
-        from smart_commit.utils.message_extractor import MessageExtractor
+    async def _confirm_security_scan(self, scan_task: Awaitable[Dict[str, Any]]) -> bool:
+        """Wait for the security scan, show it, and tell whether the commit may go ahead."""
+        with self.console.show_progress_spinner("Running security scan"):
+            scan_result = await scan_task
+            await self._ux_pause()
         
-        # Create message extractor instance
-        message_extractor = MessageExtractor()
+        self.console.show_security_scan_results(scan_result)
         
+        if scan_result["should_block_commit"]:
+            if self.settings.ui.interactive:
+                if not self.console.confirm_action("Secrets detected! Continue with commit anyway?"):
+                    self.console.print_info("Commit cancelled for security")
+                    return False
+            else:
+                self.console.print_error("Commit blocked - secrets detected")
+                return False
+        return True
+    
+    async def _ux_pause(self) -> None:
+        """Pause briefly so spinners stay visible, if an animation delay is configured."""
+        if self._ux_delay:
+            await asyncio.sleep(self._ux_delay)
+    
+    def _get_repository_state(self) -> RepositoryState:
+        """Get repository state, reusing it while HEAD, branch and index are unchanged."""
+        repo = self.git_repo.repo
+        max_lines = self.settings.git.max_diff_lines
+        
+        try:
+            head_sha = repo.head.commit.hexsha
+        except ValueError:
+            head_sha = None  # No commits yet
+        branch = None if repo.head.is_detached else repo.head.reference.name
+        try:
+            index_mtime = os.stat(os.path.join(repo.git_dir, "index")).st_mtime_ns
+        except OSError:
+            index_mtime = None
+        
+        key = (head_sha, branch, index_mtime, max_lines)
+        if key not in self._state_cache:
+            self._state_cache = {key: self.git_repo.get_repository_state(max_lines)}
+        return self._state_cache[key]
+    
+    async def _ingest_untracked(self, untracked_item: str, enhanced_context: str) -> Optional[FileChange]:
+        """Build a pseudo-diff FileChange for an untracked file or directory."""
+        item_path = Path(self.git_repo.repo_path) / untracked_item
+        try:
+            # One stat in the worker pool answers both the file and directory checks
+            mode = (await asyncio.to_thread(os.stat, item_path)).st_mode
+        except OSError:
+            return None
+        
+        if stat.S_ISREG(mode):
+            # Handle single file, reading only the lines the preview can show
+            max_lines = self.settings.git.max_diff_lines
+            lines, line_count = await asyncio.to_thread(self._read_file_preview, item_path, max_lines)
+            
+            # Enhanced new file context for better AI understanding
+            file_type_info = self._analyze_new_file_type(item_path)
+            
+            if line_count > max_lines:
+                lines.append(f"... (truncated, {line_count - max_lines} more lines)")
+            diff_content = (
+                f"--- /dev/null\n+++ b/{untracked_item}\n"
+                f"+NEW FILE: {untracked_item}\n"
+                f"+FILE TYPE: {file_type_info.type}\n"
+                f"+PURPOSE: {file_type_info.description}\n"
+                f"+CONTEXT: {enhanced_context}\n"
+                "+CONTENT PREVIEW:\n"
+            )
+            if lines:
+                # One join instead of growing the string line by line
+                diff_content += "+" + "\n+".join(lines) + "\n"
+            
+            return FileChange(
+                file_path=untracked_item,
+                change_type='A',
+                diff_content=diff_content,
+                lines_added=line_count,
+                lines_removed=0
+            )
+        
+        if stat.S_ISDIR(mode):
+            # Handle directory as a unit
+            # Get summary of files in directory
+            total_files, py_files = await asyncio.to_thread(self._count_directory_files, item_path)
+            
+            # Create summary diff for directory
+            package_line = f"+Python package: {py_files} Python files\n" if py_files else ""
+            if total_files >= _DIRECTORY_SCAN_LIMIT:
+                size_line = f"+Large new directory with at least {total_files} files\n"
+            else:
+                size_line = f"+New directory with {total_files} files\n"
+            diff_content = (
+                f"--- /dev/null\n+++ b/{untracked_item}/\n"
+                f"{size_line}"
+                f"{package_line}"
+            )
+            
+            return FileChange(
+                file_path=untracked_item,
+                change_type='A',
+                diff_content=diff_content,
+                lines_added=total_files,
+                lines_removed=0
+            )
+        
+        return None
+    
+    @staticmethod
+    def _read_file_preview(file_path: Path, max_lines: int) -> Tuple[List[str], int]:
+        """Read the first max_lines lines of a text file and count all of its lines."""
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = [line.rstrip('\r\n') for line in itertools.islice(f, max_lines)]
+            # Keep counting past the preview without holding the rest in memory
+            line_count = len(lines) + sum(1 for _ in f)
+        return lines, line_count
+    
+    def _count_directory_files(self, directory: Path) -> Tuple[int, int]:
+        """Count files and Python files below a directory, stopping at the scan limit."""
+        total_files = 0
+        py_files = 0
+        stack = [os.fspath(directory)]
+        
+        # Iterative scandir walk: DirEntry type checks avoid a stat() per entry
+        while stack and total_files < _DIRECTORY_SCAN_LIMIT:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_files += 1
+                            if entry.name.endswith('.py'):
+                                py_files += 1
+                            if total_files >= _DIRECTORY_SCAN_LIMIT:
+                                break
+            except OSError as e:
+                logger.debug(f"Could not scan {current}: {e}")
+        
+        if total_files >= _DIRECTORY_SCAN_LIMIT:
+            logger.debug(f"Stopped counting {directory} at {total_files} files")
+        return total_files, py_files
+    
+    async def _generate_traditional_commit_message(self, repo_state: RepositoryState) -> str:
+        """Generate a commit message for traditional (multi-file) commits."""
         # Generate message for all changes
         prompt = self.prompt_builder.build_commit_prompt(
             repo_state=repo_state,
@@ -289,126 +619,293 @@ class SmartCommit:
         
         logger.debug(f"Generating traditional commit message for {len(repo_state.all_changes)} files")
         
-        response = await self.ai_backend.call_with_retry(
-            prompt,
-            max_retries=self.settings.ai.max_retries
-        )
+        cached_message = await self._get_cached_message(prompt)
+        if cached_message:
+            logger.debug(f"Reusing cached traditional commit message: {cached_message}")
+            return cached_message
         
-        commit_message = message_extractor.extract_commit_message(response.content)
+        response_content = await self._generate_with_live_preview(prompt)
+        
+        commit_message = message_extractor.extract_commit_message(response_content)
         
         if commit_message:
             logger.debug(f"Generated traditional commit message: {commit_message}")
+            self._cache_message(prompt, commit_message)
             return commit_message
         else:
             logger.warning("Failed to extract traditional commit message")
             raise ValueError("Failed to extract commit message")
     
-    async def _generate_commit_message(self, file_change: FileChange) -> str:
-        """Generate a commit message for a single file change."""
-        from smart_commit.utils.message_extractor import MessageExtractor
+    async def _generate_with_live_preview(self, prompt: str) -> str:
+        """Stream a response into a live preview, falling back to a regular call with retries."""
+        if self.settings.ui.interactive and self.console.console.is_terminal:
+            chunks: List[str] = []
+            try:
+                with self.console.live_preview() as update:
+                    async for text in self.ai_backend.stream_generate(prompt):
+                        chunks.append(text)
+                        update("".join(chunks))
+                
+                content = "".join(chunks)
+                if len(content.strip()) >= 10:
+                    return content
+                logger.debug(f"Streamed response too short, retrying without streaming: '{content}'")
+            except Exception as e:
+                logger.debug(f"Streaming generation failed, retrying without streaming: {e}")
         
-        # Create message extractor instance
-        message_extractor = MessageExtractor()
+        response = await self.ai_backend.call_with_retry(
+            prompt,
+            max_retries=self.settings.ai.max_retries
+        )
+        return response.content
+    
+    async def _get_ai_concurrency(self) -> int:
+        """Get how many AI requests to run at once: the configured limit, else the server's slots."""
+        if self.settings.ai.max_concurrency:
+            return self.settings.ai.max_concurrency
+        slots = await self.ai_backend.parallel_slots()
+        return min(slots, 64) if slots else _DEFAULT_AI_CONCURRENCY
+    
+    async def _get_cached_message(self, prompt: str, file_change: Optional[FileChange] = None) -> Optional[str]:
+        """Get a commit message previously generated for an identical prompt or a near-identical file diff."""
+        if self.llm_cache is not None:
+            key = DiskCache.make_key(self.ai_backend.backend_type, self.ai_backend.model, prompt)
+            message = self.llm_cache.get(key)
+            if message:
+                return message
+        
+        # Only single-file diffs are matched by similarity, and only against the same file
+        if self.semantic_cache is None or file_change is None:
+            return None
         
-        # Check if this is a large diff that will be truncated
-        # Get original diff length from Git (before truncation)
         try:
-            original_diff = self.git_repo.repo.git.diff("HEAD", "--", file_change.file_path)
-            original_lines = len(original_diff.split('\n')) if original_diff else 0
-            
-            if original_lines > self.settings.git.truncation_threshold:
-                self.console.show_truncation_notice(
-                    file_change.file_path, 
-                    original_lines, 
-                    self.settings.git.max_diff_lines
-                )
+            # Prompts share long instruction text, so only the path and diff are embedded
+            embedding = await self.ai_backend.embed(f"{file_change.file_path}\n{file_change.diff_content or ''}")
         except Exception as e:
-            logger.debug(f"Could not get original diff length for {file_change.file_path}: {e}")
+            logger.debug(f"Embedding failed, disabling semantic cache: {e}")
+            self.semantic_cache = None
+            return None
+        
+        # Kept so the generated message can be stored under the same embedding
+        self._prompt_embeddings[prompt] = (file_change.file_path, embedding)
+        return self.semantic_cache.query(
+            embedding, file_change.file_path, self.settings.performance.semantic_cache_threshold
+        )
+    
+    def _cache_message(self, prompt: str, message: str) -> None:
+        """Remember the commit message generated for a prompt."""
+        if self.llm_cache is not None:
+            key = DiskCache.make_key(self.ai_backend.backend_type, self.ai_backend.model, prompt)
+            self.llm_cache.set(key, self.ai_backend.model, message)
+        
+        entry = self._prompt_embeddings.pop(prompt, None)
+        if entry and self.semantic_cache is not None:
+            file_path, embedding = entry
+            self.semantic_cache.add(embedding, file_path, message)
+    
+    def _build_file_prompt(self, file_change: FileChange) -> str:
+        """Build the AI prompt for a single file change."""
+        # Check if this is a large diff that will be truncated
+        # Original changed-line count from Git (before truncation), shared across files
+        if self._numstat is None:
+            self._numstat = self.git_repo.get_numstat()
+        added, removed = self._numstat.get(file_change.file_path, (0, 0))
+        original_lines = added + removed
+        
+        if original_lines > self.settings.git.truncation_threshold:
+            self.console.show_truncation_notice(
+                file_change.file_path, 
+                original_lines, 
+                self.settings.git.max_diff_lines
+            )
         
         # Generate message for this specific file
-        logger.info(f"🔍 FILE CHANGE OBJECT FOR {file_change.file_path}:")
-        logger.info(f"📊 Change type: {file_change.change_type}")
-        logger.info(f"📈 Diff content length: {len(file_change.diff_content) if file_change.diff_content else 0}")
-        logger.info(f"📋 Diff content preview: {file_change.diff_content[:100] if file_change.diff_content else 'None'}...")
+        logger.debug("🔍 FILE CHANGE OBJECT FOR {}:", file_change.file_path)
+        logger.debug("📊 Change type: {}", file_change.change_type)
+        logger.opt(lazy=True).debug("📈 Diff content length: {}", lambda: len(file_change.diff_content or ""))
+        logger.opt(lazy=True).debug("📋 Diff content preview: {}...", lambda: file_change.diff_content[:100] if file_change.diff_content else 'None')
         
-        prompt = self.prompt_builder.build_commit_prompt(
+        return self.prompt_builder.build_commit_prompt(
             repo_state=None,  # Not needed for single file
             file_context=file_change
         )
+    
+    def _extract_file_message(self, file_change: FileChange, content: str) -> str:
+        """Extract the commit message for a single file from an AI response."""
+        commit_message = message_extractor.extract_commit_message(content)
+        
+        if commit_message:
+            logger.debug("Generated message for {}: {}", file_change.file_path, commit_message)
+            return commit_message
+        else:
+            logger.warning("Failed to extract commit message for {}", file_change.file_path)
+            raise ValueError("Failed to extract commit message")
+    
+    async def _generate_commit_message(self, file_change: FileChange) -> str:
+        """Generate a commit message for a single file change."""
+        prompt = self._build_file_prompt(file_change)
         
-        logger.debug(f"Generating commit message for {file_change.file_path}")
+        logger.debug("Generating commit message for {}", file_change.file_path)
+        
+        cached_message = await self._get_cached_message(prompt, file_change)
+        if cached_message:
+            return cached_message
         
         response = await self.ai_backend.call_with_retry(
             prompt,
             max_retries=self.settings.ai.max_retries
         )
         
-        commit_message = message_extractor.extract_commit_message(response.content)
-        
-        if commit_message:
-            logger.debug(f"Generated message for {file_change.file_path}: {commit_message}")
-            return commit_message
-        else:
-            logger.warning(f"Failed to extract commit message for {file_change.file_path}")
-            raise ValueError("Failed to extract commit message")
+        message = self._extract_file_message(file_change, response.content)
+        self._cache_message(prompt, message)
+        return message
     
-    async def _generate_atomic_commit_messages(self, file_changes: List[FileChange]) -> List[Dict[str, str]]:
+    async def _generate_atomic_commit_messages(self, file_changes: List[FileChange]) -> List[ProposedCommit]:
         """Generate commit messages for each file change."""
         commit_messages = []
         seen_files = set()  # Track files to avoid duplicates
+        unique_changes = []
         total_start_time = time.time()
         
-        self.console.console.print(f"\n[bold blue]Generating commit messages for {len(file_changes)} files...[/bold blue]")
-        
-        for i, file_change in enumerate(file_changes, 1):
+        for file_change in file_changes:
             # Skip if we've already generated a message for this file
             if file_change.file_path in seen_files:
                 logger.warning(f"Skipping duplicate file: {file_change.file_path}")
                 continue
             
             seen_files.add(file_change.file_path)
-            file_start_time = time.time()
-            self.console.console.print(f"\n[cyan]Processing file {i}/{len(file_changes)}:[/cyan] {file_change.file_path}")
+            unique_changes.append(file_change)
+        
+        self.console.console.print(f"\n[bold blue]Generating commit messages for {len(unique_changes)} files...[/bold blue]")
+        
+        # Boilerplate files get a rule-based message without an AI round trip
+        results: List[Any] = [
+            try_trivial(file_change, self.prompt_builder._extract_scope(file_change.file_path))
+            for file_change in unique_changes
+        ]
+        trivial = {i for i, result in enumerate(results) if result}
+        pending = [i for i in range(len(unique_changes)) if i not in trivial]
+        
+        # Build every prompt up front, then let the backend run them concurrently
+        prompts: List[Optional[str]] = [None] * len(unique_changes)
+        for i in pending:
+            prompts[i] = self._build_file_prompt(unique_changes[i])
+        
+        # Cached messages are used as-is; only the misses go to the backend.
+        # Semantic lookups embed on the AI server, so they share its request limit
+        concurrency = await self._get_ai_concurrency()
+        lookup_slots = asyncio.Semaphore(concurrency)
+        
+        async def _lookup(i: int) -> Optional[str]:
+            async with lookup_slots:
+                return await self._get_cached_message(prompts[i], unique_changes[i])
+        
+        cached_messages = await asyncio.gather(*(_lookup(i) for i in pending))
+        for i, message in zip(pending, cached_messages):
+            results[i] = message
+        pending = [i for i in pending if results[i] is None]
+        
+        # Backends that handle it get a single request covering every pending file
+        batched = set()
+        if self.settings.ai.supports_batching and 1 < len(pending) <= self.settings.ai.batch_size:
+            batch_messages = await self._generate_batch_messages([unique_changes[i] for i in pending])
+            for i, message in zip(pending, batch_messages):
+                if message:
+                    results[i] = message
+                    batched.add(i)
+                    self._cache_message(prompts[i], message)
+            pending = [i for i in pending if results[i] is None]
+        
+        if pending:
+            with self.console.show_progress_bar(len(pending), "Generating messages") as progress:
+                task = progress.add_task("Generating commit messages...", total=len(pending))
+                
+                async for index, result in self.ai_backend.iter_batch_generate(
+                    [prompts[i] for i in pending],
+                    max_concurrency=concurrency,
+                    max_retries=self.settings.ai.max_retries
+                ):
+                    results[pending[index]] = result
+                    progress.advance(task)
+        
+        for i, (file_change, prompt, result) in enumerate(zip(unique_changes, prompts, results)):
+            self.console.console.print(f"\n[cyan]File {i + 1}/{len(unique_changes)}:[/cyan] {file_change.file_path}")
             
             try:
-                # Time the AI call specifically
-                ai_start_time = time.time()
-                message = await self._generate_commit_message(file_change)
-                ai_duration = time.time() - ai_start_time
+                if isinstance(result, BaseException):
+                    raise result
                 
-                file_duration = time.time() - file_start_time
-                total_duration = time.time() - total_start_time
-                
-                self.console.console.print(f"  ✅ Generated in {ai_duration:.2f}s (file: {file_duration:.2f}s, total: {total_duration:.2f}s)")
+                if isinstance(result, str):
+                    message = result
+                    ai_duration = 0
+                    if i in trivial:
+                        self.console.console.print("  ✅ Matched a trivial-file rule")
+                    elif i in batched:
+                        self.console.console.print("  ✅ Generated in batch request")
+                    else:
+                        self.console.console.print("  ✅ Reused cached message")
+                else:
+                    message = self._extract_file_message(file_change, result.content)
+                    ai_duration = result.response_time or 0
+                    self._cache_message(prompt, message)
+                    self.console.console.print(f"  ✅ Generated in {ai_duration:.2f}s")
                 
-                commit_messages.append({
-                    "file_path": file_change.file_path,
-                    "message": message,
-                    "ai_time": ai_duration,
-                    "total_time": file_duration
-                })
+                commit_messages.append(ProposedCommit(
+                    file_path=file_change.file_path,
+                    message=message,
+                    ai_time=ai_duration,
+                    total_time=ai_duration
+                ))
                 
             except Exception as e:
-                file_duration = time.time() - file_start_time
-                total_duration = time.time() - total_start_time
-                
-                self.console.console.print(f"  ❌ Failed in {file_duration:.2f}s (file: {file_duration:.2f}s, total: {total_duration:.2f}s)")
-                logger.debug(f"Failed to generate message for {file_change.file_path}: {e}")
+                self.console.console.print("  ❌ Failed, using fallback message")
+                logger.debug("Failed to generate message for {}: {}", file_change.file_path, e)
                 
                 # Generate intelligent fallback
                 fallback_message = self._generate_intelligent_fallback(file_change)
-                commit_messages.append({
-                    "file_path": file_change.file_path,
-                    "message": fallback_message,
-                    "ai_time": 0,
-                    "total_time": file_duration
-                })
+                commit_messages.append(ProposedCommit(
+                    file_path=file_change.file_path,
+                    message=fallback_message
+                ))
         
         total_duration = time.time() - total_start_time
         self.console.console.print(f"\n[bold green]✅ All commit messages generated in {total_duration:.2f}s total[/bold green]")
         
         return commit_messages
     
+    async def _generate_batch_messages(self, file_changes: List[FileChange]) -> List[Optional[str]]:
+        """Generate messages for several files in one AI request; unanswered files get None."""
+        messages: List[Optional[str]] = [None] * len(file_changes)
+        prompt = self.prompt_builder.build_batch_commit_prompt(file_changes)
+        
+        logger.debug(f"Generating batched commit messages for {len(file_changes)} files")
+        
+        try:
+            response = await self.ai_backend.call_with_retry(
+                prompt,
+                max_retries=self.settings.ai.max_retries
+            )
+        except Exception as e:
+            logger.debug(f"Batched generation failed, falling back to per-file requests: {e}")
+            return messages
+        
+        content = response.content
+        try:
+            entries = orjson.loads(content[content.index('['):content.rindex(']') + 1])
+        except ValueError as e:
+            logger.debug(f"Batched response is not JSON, parsing numbered entries: {e}")
+            return message_extractor.extract_batch(content, len(file_changes))
+        
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            message = entry.get("message")
+            if isinstance(index, int) and 0 <= index < len(messages) and isinstance(message, str):
+                messages[index] = message_extractor.extract_commit_message(message)
+        
+        return messages
+    
     def _generate_intelligent_fallback(self, file_change: FileChange) -> str:
         """Generate an intelligent fallback commit message based on file context."""
         file_path = file_change.file_path
@@ -418,88 +915,21 @@ class SmartCommit:
         scope = self.prompt_builder._extract_scope(file_path)
         
         # Analyze the file path to determine appropriate commit type and scope
-        if 'install' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'install'}): update installation configuration"
-            elif change_type == 'A':
-                return f"feat({scope or 'install'}): add new installation feature"
-            elif change_type == 'D':
-                return f"chore({scope or 'install'}): remove deprecated installation code"
-        
-        elif 'llamacpp' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'ai'}): resolve llamacpp backend issues"
-            elif change_type == 'A':
-                return f"feat({scope or 'ai'}): add new llamacpp functionality"
-        
-        elif 'prompts' in file_path.lower():
-            if change_type == 'M':
-                return f"refactor({scope or 'utils'}): improve prompt generation logic"
-            elif change_type == 'A':
-                return f"feat({scope or 'utils'}): add new prompt templates"
-        
-        elif 'message_extractor' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'utils'}): resolve message extraction issues"
-            elif change_type == 'A':
-                return f"feat({scope or 'utils'}): add new message extraction features"
-        
-        elif 'base.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'ai'}): improve backend base functionality"
-            elif change_type == 'A':
-                return f"feat({scope or 'ai'}): add new backend features"
-        
-        elif 'cli.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'core'}): improve command-line interface"
-            elif change_type == 'A':
-                return f"feat({scope or 'core'}): add new CLI options"
-        
-        elif 'core.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'core'}): improve core application logic"
-            elif change_type == 'A':
-                return f"feat({scope or 'core'}): add new core functionality"
-        
-        elif 'repository.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'git'}): improve git operations handling"
-            elif change_type == 'A':
-                return f"feat({scope or 'git'}): add new git operation features"
-        
-        elif 'console.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'ui'}): improve console output handling"
-            elif change_type == 'A':
-                return f"feat({scope or 'ui'}): add new console features"
-        
-        elif 'settings.py' in file_path.lower():
-            if change_type == 'M':
-                return f"fix({scope or 'config'}): update configuration settings"
-            elif change_type == 'A':
-                return f"feat({scope or 'config'}): add new configuration options"
+        lower_path = file_path.lower()
+        for keyword, default_scope, messages in _FALLBACK_RULES:
+            if keyword in lower_path:
+                template = messages.get(change_type)
+                if template:
+                    return template.format(scope or default_scope)
+                break
         
         # Generic fallback based on change type with proper scope
-        if change_type == 'M':
-            # Remove file extension for cleaner scope
-            filename = file_path.split('/')[-1]
-            clean_filename = filename.replace('.py', '').replace('.sh', '').replace('.md', '')
-            return f"fix({scope or 'smart_commit'}): update {clean_filename}"
-        elif change_type == 'A':
-            filename = file_path.split('/')[-1]
-            clean_filename = filename.replace('.py', '').replace('.sh', '').replace('.md', '')
-            return f"feat({scope or 'smart_commit'}): add {clean_filename}"
-        elif change_type == 'D':
-            filename = file_path.split('/')[-1]
-            clean_filename = filename.replace('.py', '').replace('.sh', '').replace('.md', '')
-            return f"chore({scope or 'smart_commit'}): remove {clean_filename}"
-        else:
-            filename = file_path.split('/')[-1]
-            clean_filename = filename.replace('.py', '').replace('.sh', '').replace('.md', '')
-            return f"update({scope or 'smart_commit'}): {clean_filename}"
+        # Remove file extension for cleaner scope
+        clean_filename = _FALLBACK_EXTENSION.sub('', file_path.rpartition('/')[2])
+        template = _GENERIC_FALLBACKS.get(change_type, "update({}): {}")
+        return template.format(scope or 'smart_commit', clean_filename)
     
-    async def _handle_atomic_commits_approval(self, proposed_commits: List[Dict[str, str]]) -> Optional[List[Dict[str, str]]]:
+    async def _handle_atomic_commits_approval(self, proposed_commits: List[ProposedCommit]) -> Optional[List[ProposedCommit]]:
         """Handle user approval and editing of atomic commits with interactive navigation."""
         current_index = 0  # Remember the current selection
         
@@ -519,96 +949,150 @@ class SmartCommit:
                     proposed_commits, index, current_index
                 )
                 if new_message:
-                    proposed_commits[index]["message"] = new_message
-                    self.console.print_success(f"✅ Updated commit message for {proposed_commits[index]['file_path']}")
+                    proposed_commits[index].message = new_message
+                    self.console.print_success(f"✅ Updated commit message for {proposed_commits[index].file_path}")
                 
                 # Continue the loop to show updated table, staying at the same position
     
-    async def _create_atomic_commits(self, proposed_commits: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        """Create individual commits for each file."""
+    async def _create_atomic_commits(
+        self,
+        proposed_commits: List[ProposedCommit],
+        secret_scans: Optional[Awaitable[Dict[str, Optional[Dict[str, Any]]]]] = None
+    ) -> List[ProposedCommit]:
+        """Create individual commits for each file, using secret scans started earlier if given."""
+        if secret_scans is None:
+            secret_scans = self._scan_files_for_secrets([commit_data.file_path for commit_data in proposed_commits])
+        with self.console.show_progress_spinner("Running security scans"):
+            scan_results = await secret_scans
+        
         created_commits = []
         
+        # One status read serves both the streamed and the file-by-file path
+        try:
+            statuses = await asyncio.to_thread(
+                self.git_repo.changed_paths, [commit_data.file_path for commit_data in proposed_commits]
+            )
+        except GitRepositoryError as e:
+            self.console.print_error(f"Failed to read file status: {e}")
+            return created_commits
+        
+        streamed_commits = await self._stream_atomic_commits(proposed_commits, statuses, scan_results)
+        if streamed_commits is not None:
+            return streamed_commits
+        
         with self.console.show_progress_bar(len(proposed_commits), "Creating commits") as progress:
             task = progress.add_task("Committing files...", total=len(proposed_commits))
             
             for commit_data in proposed_commits:
                 try:
-                    file_path = commit_data["file_path"]
-                    message = commit_data["message"]
-                    
-                    # Check if file exists or was deleted
-                    file_full_path = Path(self.git_repo.repo_path) / file_path
-                    is_deleted = not file_full_path.exists()
+                    file_path = commit_data.file_path
+                    message = commit_data.message
                     
                     # Check if file has any changes to commit
-                    status_output = self.git_repo.repo.git.status('--porcelain', file_path)
-                    if not status_output.strip():
+                    status = statuses.get(file_path)
+                    if status is None:
                         logger.warning(f"File {file_path} has no changes to commit - skipping")
                         self.console.print_warning(f"No changes for {file_path} - skipping")
                         progress.advance(task)
                         continue
                     
-                    # Stage only this file (handles both existing and deleted files)
-                    try:
-                        if is_deleted:
-                            # For deleted files, use git rm
-                            self.git_repo.repo.index.remove([file_path])
-                        else:
-                            # For existing files, stage normally
-                            self.git_repo.stage_files([file_path])
-                    except Exception as stage_error:
-                        logger.warning(f"Failed to stage {file_path}: {stage_error}")
-                        # Try alternative staging method
-                        self.git_repo.repo.git.add(file_path, force=True)
-                    
-                    # Security scan for non-deleted files
-                    if not is_deleted:
-                        scan_result = await self.security_scanner.scan_before_commit(
-                            self.git_repo.repo_path, 
-                            [file_path]
-                        )
-                        
-                        if scan_result["should_block_commit"]:
-                            if scan_result["secrets_found"]:
-                                self.console.print_warning(f"Secrets detected in {file_path} - skipping commit")
-                                continue
-                    
-                    # Check if there are staged changes for this file
-                    staged_files = self.git_repo.repo.index.diff("HEAD")
-                    has_staged_changes = any(d.a_path == file_path or d.b_path == file_path for d in staged_files)
-                    
-                    if not has_staged_changes and not is_deleted:
-                        logger.warning(f"No staged changes for {file_path} - skipping")
-                        self.console.print_warning(f"No staged changes for {file_path} - skipping")
+                    # Security scan result for non-deleted files
+                    scan_result = scan_results.get(file_path)
+                    if scan_result and scan_result["should_block_commit"] and scan_result["secrets_found"]:
+                        self.console.print_warning(f"Secrets detected in {file_path} - skipping commit")
                         progress.advance(task)
                         continue
                     
-                    # Create commit
-                    commit_hash = self.git_repo.commit(message)
+                    # Stage and commit only this file in one git call
+                    commit_hash = await asyncio.to_thread(self.git_repo.commit_file, file_path, message, status)
+                    self._state_cache.clear()
+                    self._numstat = None
+                    self._tracked_dirs = None
                     
-                    created_commits.append({
-                        "file_path": file_path,
-                        "message": message,
-                        "hash": commit_hash
-                    })
+                    commit_data.hash = commit_hash
+                    created_commits.append(commit_data)
                     
-                    logger.info(f"Created commit {commit_hash[:8]} for {file_path}")
+                    logger.info("Created commit {} for {}", commit_hash[:8], file_path)
                     
                 except Exception as e:
-                    logger.error(f"Failed to commit {commit_data['file_path']}: {e}")
-                    self.console.print_error(f"Failed to commit {commit_data['file_path']}: {e}")
+                    logger.error(f"Failed to commit {commit_data.file_path}: {e}")
+                    self.console.print_error(f"Failed to commit {commit_data.file_path}: {e}")
                 
                 progress.advance(task)
-                await asyncio.sleep(0.1)
         
         return created_commits
     
+    async def _stream_atomic_commits(
+        self,
+        proposed_commits: List[ProposedCommit],
+        statuses: Dict[str, str],
+        scan_results: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Optional[List[ProposedCommit]]:
+        """Create all atomic commits in one git fast-import pass, or return None to commit file by file.
+        
+        None is only returned while the branch is untouched; once the commits exist they are
+        reported even if the index could not be brought up to date.
+        """
+        file_paths = [commit_data.file_path for commit_data in proposed_commits]
+        if not await asyncio.to_thread(self.git_repo.can_stream_commits, file_paths, statuses):
+            return None
+        
+        ready = []
+        with self.console.show_progress_bar(len(proposed_commits), "Creating commits") as progress:
+            task = progress.add_task("Committing files...", total=len(proposed_commits))
+            
+            candidates = []
+            for commit_data in proposed_commits:
+                file_path = commit_data.file_path
+                if file_path not in statuses:
+                    logger.warning(f"File {file_path} has no changes to commit - skipping")
+                    self.console.print_warning(f"No changes for {file_path} - skipping")
+                    progress.advance(task)
+                    continue
+                candidates.append(commit_data)
+            
+            for commit_data in candidates:
+                scan_result = scan_results.get(commit_data.file_path)
+                if scan_result and scan_result["should_block_commit"] and scan_result["secrets_found"]:
+                    self.console.print_warning(f"Secrets detected in {commit_data.file_path} - skipping commit")
+                else:
+                    ready.append(commit_data)
+                progress.advance(task)
+            
+            try:
+                hashes = await asyncio.to_thread(self.git_repo.atomic_commit_stream, ready)
+            except GitRepositoryError as e:
+                logger.warning(f"Streamed commits failed, committing file by file: {e}")
+                return None
+            finally:
+                self._state_cache.clear()
+                self._numstat = None
+                self._tracked_dirs = None
+        
+        for commit_data, commit_hash in zip(ready, hashes):
+            commit_data.hash = commit_hash
+        
+        # The branch already has the commits, so an index failure is reported rather than retried
+        try:
+            await asyncio.to_thread(self.git_repo.sync_index, [commit_data.file_path for commit_data in ready])
+        except GitRepositoryError as e:
+            logger.error(f"Index not updated after streamed commits: {e}")
+            self.console.print_warning(
+                "Commits were created but the index still shows them as changed; "
+                "run 'git reset -q HEAD -- <paths>' to refresh it"
+            )
+        return ready
+    
+    async def _scan_files_for_secrets(self, file_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Security scan files in one batch, mapping deleted files to None."""
+        results = await self.security_scanner.scan_files(Path(self.git_repo.repo_path), file_paths)
+        return {file_path: results.get(file_path) for file_path in file_paths}
+    
     async def _push_commits(self) -> None:
         """Push commits to remote repository."""
         try:
             with self.console.show_progress_spinner("Pushing to remote"):
-                self.git_repo.push()
-                await asyncio.sleep(0.5)
+                await asyncio.to_thread(self.git_repo.push)
             
             self.console.print_success("Successfully pushed commits to remote")
             
@@ -674,128 +1158,92 @@ class SmartCommit:
     def _get_top_level_untracked(self, untracked_files: List[str]) -> List[str]:
         """Get top-level untracked items (files and directories), not recursive."""
         top_level_items = set()
+        add = top_level_items.add
         
         for file_path in untracked_files:
             # Get the first path component
-            parts = file_path.split('/')
-            if parts:
-                top_level = parts[0]
-                
-                # Check if this top-level directory already exists in git
-                if len(parts) > 1:  # This is a file/directory inside a parent directory
-                    if self._directory_exists_in_git(top_level):
-                        # Parent directory exists, so add the specific nested item
-                        # This will be processed as an individual file/directory change
-                        top_level_items.add(file_path)
-                        continue
-                
-                # Either it's a top-level file or a completely new directory
-                top_level_items.add(top_level)
+            top_level, separator, _ = file_path.partition('/')
+            if not top_level:
+                continue
+            
+            # Check if this top-level directory already exists in git
+            if separator:  # This is a file/directory inside a parent directory
+                if self._directory_exists_in_git(top_level):
+                    # Parent directory exists, so add the specific nested item
+                    # This will be processed as an individual file/directory change
+                    add(file_path)
+                    continue
+            
+            # Either it's a top-level file or a completely new directory
+            add(top_level)
         
-        return sorted(list(top_level_items))
+        return sorted(top_level_items)
 
     def _directory_exists_in_git(self, directory: str) -> bool:
         """Check if a directory already exists in git (tracked or has tracked content)."""
-        try:
-            repo = self.git_repo.repo
-            if not repo:
-                return False
-            
-            # Check if the directory itself is tracked
+        return directory.rstrip('/') in self._get_tracked_dirs()
+    
+    def _get_tracked_dirs(self) -> Set[str]:
+        """Get every directory that contains tracked files, listing the index once per run."""
+        if self._tracked_dirs is None:
+            tracked_dirs = set()
             try:
-                # Try to get the tree object for this directory
-                tree = repo.tree()
-                for item in tree.traverse():
-                    if item.path == directory or item.path.startswith(f"{directory}/"):
-                        return True
-            except:
-                pass
-            
-            # Check if there are any tracked files in this directory
-            tracked_files = [f for f in repo.tree().traverse() if f.path.startswith(f"{directory}/")]
-            if tracked_files:
-                return True
-            
-            # Check if the directory exists in the working tree (even if untracked)
-            # but has tracked content from previous commits
-            working_dir = Path(self.git_repo.repo_path) / directory
-            if working_dir.exists() and working_dir.is_dir():
-                # Check if any files in this directory are tracked
-                for item in working_dir.rglob('*'):
-                    if item.is_file():
-                        try:
-                            # Check if this file is tracked in git
-                            repo.git.ls_files(str(item.relative_to(self.git_repo.repo_path)))
-                            return True
-                        except:
-                            # File is not tracked, continue checking others
-                            continue
-            
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Could not check if directory {directory} exists in git: {e}")
-            return False
+                for path in self.git_repo.repo.git.ls_files('-z').split('\0'):
+                    # Record each ancestor directory of the tracked file
+                    slash = path.find('/')
+                    while slash != -1:
+                        tracked_dirs.add(path[:slash])
+                        slash = path.find('/', slash + 1)
+            except Exception as e:
+                logger.debug(f"Could not list tracked files: {e}")
+            self._tracked_dirs = tracked_dirs
+        return self._tracked_dirs
 
-    def _analyze_new_file_type(self, file_path: Path, content: str) -> Dict[str, str]:
+    def _analyze_new_file_type(self, file_path: Path) -> NewFileKind:
         """Analyze new file to determine appropriate commit type and description."""
-        file_info = {
-            'extension': file_path.suffix.lower(),
-            'is_documentation': file_path.suffix.lower() in ['.md', '.txt', '.rst', '.adoc'],
-            'is_script': file_path.suffix.lower() in ['.py', '.sh', '.js', '.ts', '.rb', '.php'],
-            'is_config': file_path.suffix.lower() in ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg'],
-            'is_data': file_path.suffix.lower() in ['.csv', '.xml', '.sql', '.db'],
-            'content_preview': content[:200] if content else ''
-        }
-        
-        # Determine commit type based on analysis
-        if file_info['is_documentation']:
-            return {'type': 'docs', 'description': 'documentation'}
-        elif file_info['is_script']:
-            return {'type': 'feat', 'description': 'new script/utility'}
-        elif file_info['is_config']:
-            return {'type': 'chore', 'description': 'configuration'}
-        elif file_info['is_data']:
-            return {'type': 'feat', 'description': 'data file'}
-        else:
-            return {'type': 'feat', 'description': 'new file'}
+        return _NEW_FILE_KINDS.get(file_path.suffix.lower(), _NEW_FILE_OTHER)
 
-    def _enhance_new_file_context(self, file_path: str, repo_state: RepositoryState) -> str:
+    def _enhance_new_file_context(self, file_path: str, existing_dirs: FrozenSet[str]) -> str:
         """Add context about where the new file fits in the project."""
+        # Get the parent directory of the new file
+        parent_dir, sep, _ = file_path.partition('/')
+        
+        # Check if this is adding to an existing directory structure
+        if not sep:
+            context = "Creating new file at repository root"
+        elif parent_dir in existing_dirs:
+            context = f"Adding new content to existing {parent_dir} directory"
+        else:
+            context = f"Creating new {parent_dir} directory structure"
+        
+        # Add more context based on file type
+        return context + _NEW_FILE_SUFFIX_LABELS.get(os.path.splitext(file_path)[1], "")
+    
+    def _enhance_new_files_bulk(self, file_paths: List[str]) -> Dict[str, str]:
+        """Get the new file context of several paths, listing the HEAD tree at most once."""
+        # Root level files never need the HEAD directory listing
+        existing_dirs = self._get_existing_dirs() if any('/' in file_path for file_path in file_paths) else frozenset()
+        return {file_path: self._enhance_new_file_context(file_path, existing_dirs) for file_path in file_paths}
+    
+    def _get_existing_dirs(self) -> FrozenSet[str]:
+        """Get the top-level directories in the HEAD tree, listing it once per HEAD commit."""
+        if not self.git_repo.repo:
+            return frozenset()
         try:
-            # Get existing directories from the repository
-            existing_dirs = set()
-            if self.git_repo.repo:
-                try:
-                    tree = self.git_repo.repo.tree()
-                    for item in tree.traverse():
-                        if item.type == 'tree':  # Directory
-                            existing_dirs.add(item.path)
-                except:
-                    pass
-            
-            # Get the parent directory of the new file
-            parent_dir = file_path.split('/')[0] if '/' in file_path else 'root'
-            
-            # Check if this is adding to an existing directory structure
-            if parent_dir in existing_dirs:
-                context = f"Adding new content to existing {parent_dir} directory"
-            else:
-                context = f"Creating new {parent_dir} directory structure"
-            
-            # Add more context based on file type
-            if file_path.endswith('.md'):
-                context += " (documentation)"
-            elif file_path.endswith('.py'):
-                context += " (Python script)"
-            elif file_path.endswith('.sh'):
-                context += " (shell script)"
-            
-            return context
-            
-        except Exception as e:
-            logger.debug(f"Could not enhance new file context for {file_path}: {e}")
-            return "new file addition"
+            head_sha = self.git_repo.repo.head.commit.hexsha
+        except ValueError:
+            # Unborn branch: nothing exists in git yet
+            return frozenset()
+        
+        if self._existing_dirs is None or self._existing_dirs[0] != head_sha:
+            existing_dirs = frozenset()
+            try:
+                # New file context only compares top-level names, so nested trees are never read
+                existing_dirs = self.git_repo.top_level_dirs(head_sha)
+            except GitRepositoryError as e:
+                logger.debug(f"Could not list directories in HEAD: {e}")
+            self._existing_dirs = (head_sha, existing_dirs)
+        return self._existing_dirs[1]
     
     async def _check_branch_protection(self, create_new_branch: bool = False, switch_to_branch: Optional[str] = None) -> str:
         """Check if current branch is protected and handle accordingly."""
@@ -804,7 +1252,7 @@ class SmartCommit:
         # Handle explicit branch operations first
         if create_new_branch:
             # Generate AI branch name and create branch
-            repo_state = self.git_repo.get_repository_state(self.settings.git.max_diff_lines)
+            repo_state = await asyncio.to_thread(self._get_repository_state)
             suggested_name = await self._generate_branch_name(repo_state.all_changes)
             
             if self.settings.ui.interactive:
@@ -828,7 +1276,7 @@ class SmartCommit:
     
     async def _handle_protected_branch(self, branch_name: str) -> str:
         """Handle when user is on a protected branch."""
-        repo_state = self.git_repo.get_repository_state(self.settings.git.max_diff_lines)
+        repo_state = await asyncio.to_thread(self._get_repository_state)
         
         self.console.print_warning(f"⚠️  You're about to commit to protected branch '{branch_name}'")
         
@@ -915,7 +1363,8 @@ class SmartCommit:
             logger.warning(f"Failed to generate AI branch name: {e}")
             # Fallback to simple name based on first file
             first_file = file_changes[0].file_path
-            scope = first_file.split('/')[0] if '/' in first_file else 'update'
+            head, sep, _ = first_file.partition('/')
+            scope = head if sep else 'update'
             return f"feature/{scope}-changes"
     
     def _extract_branch_name(self, ai_response: str) -> str:
@@ -1015,7 +1464,7 @@ class SmartCommit:
     async def _create_and_switch_to_new_branch(self, branch_name: str) -> str:
         """Create and switch to a new branch."""
         try:
-            self.git_repo.create_and_switch_branch(branch_name)
+            await asyncio.to_thread(self.git_repo.create_and_switch_branch, branch_name)
             self.console.print_success(f"✅ Created and switched to new branch '{branch_name}'")
             return "continue"
         except Exception as e:
@@ -1025,7 +1474,7 @@ class SmartCommit:
     async def _switch_to_existing_branch(self, branch_name: str) -> str:
         """Switch to an existing branch."""
         try:
-            self.git_repo.switch_branch(branch_name)
+            await asyncio.to_thread(self.git_repo.switch_branch, branch_name)
             self.console.print_success(f"✅ Switched to branch '{branch_name}'")
             return "continue"
         except Exception as e:
@@ -3,8 +3,11 @@ Professional Git repository operations with comprehensive error handling.
 """
 
 import os
+import stat
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from dataclasses import dataclass
 from git import Repo, InvalidGitRepositoryError, GitCommandError
 from loguru import logger
@@ -63,6 +66,17 @@ class RepositoryState:
         return len(self.all_changes) + len(self.untracked_files)
 
 
+@dataclass
+class ProposedCommit:
+    """A single-file commit planned in atomic mode."""
+    
+    file_path: str
+    message: str
+    ai_time: float = 0.0
+    total_time: float = 0.0
+    hash: Optional[str] = None
+
+
 class GitRepository:
     """Professional Git repository interface."""
     
@@ -161,12 +175,13 @@ class GitRepository:
                             change_type = 'A'  # Added
                             
                             # Get the file content for the diff
+                            line_count = 0
                             try:
                                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                    content = f.read()
-                                    lines = content.split('\n')
-                                    if len(lines) > max_lines:
-                                        lines = lines[:max_lines] + [f"... (truncated, {len(lines) - max_lines} more lines)"]
+                                    lines = f.read().split('\n')
+                                    line_count = len(lines)
+                                    if line_count > max_lines:
+                                        lines = lines[:max_lines] + [f"... (truncated, {line_count - max_lines} more lines)"]
                                     diff_content = "\n".join(lines)
                             except Exception:
                                 diff_content = f"Added file: {file_path}"
@@ -175,7 +190,7 @@ class GitRepository:
                                 file_path=file_path,
                                 change_type=change_type,
                                 diff_content=diff_content,
-                                lines_added=len(content.split('\n')) if 'content' in locals() else 0,
+                                lines_added=line_count,
                                 lines_removed=0
                             ))
                         elif staged_status == 'M':  # Staged modification
@@ -378,6 +393,209 @@ class GitRepository:
         except GitCommandError as e:
             raise GitRepositoryError(f"Failed to create commit: {e}")
     
+    def commit_file(self, file_path: str, message: str, status: str = "") -> str:
+        """Stage and commit a single path in one git call, leaving other staged changes alone."""
+        try:
+            if status == "??":
+                # commit --only accepts known paths only, so new files are added first
+                self.repo.git.add('--', file_path)
+            self.repo.git.commit('--only', '-q', '-m', message, '--', file_path)
+            commit_hash = self.repo.head.commit.hexsha
+        except (GitCommandError, ValueError) as e:
+            raise GitRepositoryError(f"Failed to commit {file_path}: {e}")
+        
+        logger.info(f"Created commit {commit_hash[:8]}: {message}")
+        return commit_hash
+    
+    def top_level_dirs(self, rev: str = "HEAD") -> FrozenSet[str]:
+        """Get the names of the directories at the root of a commit's tree."""
+        try:
+            import pygit2
+        except ImportError:
+            pygit2 = None
+        
+        if pygit2 is not None:
+            # Read the root tree in-process through libgit2 when it is installed
+            try:
+                tree = pygit2.Repository(self.repo.git_dir).revparse_single(rev).peel(pygit2.Tree)
+                return frozenset(entry.name for entry in tree if entry.type_str == 'tree')
+            except (pygit2.GitError, KeyError, ValueError) as e:
+                logger.debug(f"pygit2 tree listing failed, falling back to git ls-tree: {e}")
+        
+        try:
+            listing = self.repo.git.ls_tree('-d', '--name-only', '-z', rev)
+        except GitCommandError as e:
+            raise GitRepositoryError(f"Failed to list directories in {rev}: {e}")
+        return frozenset(filter(None, listing.split('\0')))
+    
+    def get_numstat(self, ref: str = "HEAD") -> Dict[str, Tuple[int, int]]:
+        """Get added and removed line counts per changed path against a ref, in one git call."""
+        try:
+            output = self.repo.git.diff(ref, '--numstat', '--no-renames', '-z')
+        except GitCommandError as e:
+            logger.debug(f"Failed to get numstat against {ref}: {e}")
+            return {}
+        
+        numstat = {}
+        for entry in output.split('\0'):
+            added, _, rest = entry.partition('\t')
+            removed, _, path = rest.partition('\t')
+            if path:
+                # Binary files report "-" for both counts
+                numstat[path] = (int(added) if added.isdigit() else 0, int(removed) if removed.isdigit() else 0)
+        return numstat
+    
+    def changed_paths(self, file_paths: List[str]) -> Dict[str, str]:
+        """Get the porcelain status code of each path that has changes, in one git call."""
+        try:
+            output = self.repo.git.status('--porcelain', '-z', '--', *file_paths)
+        except GitCommandError as e:
+            raise GitRepositoryError(f"Failed to read status: {e}")
+        
+        changed = {}
+        entries = iter(output.split('\0'))
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            # Untracked directories are reported as "dir/", atomic units name them "dir"
+            changed[entry[3:].rstrip('/')] = entry[:2]
+            if entry[0] in 'RC':
+                # Renames and copies carry the original path as a separate entry
+                changed[next(entries, '')] = entry[:2]
+        return changed
+    
+    def can_stream_commits(self, file_paths: List[str], statuses: Dict[str, str]) -> bool:
+        """Check whether atomic_commit_stream can write these commits exactly."""
+        try:
+            if self.repo.head.is_detached or not self.repo.head.is_valid():
+                return False
+            hooks_dir = Path(self.repo.working_dir) / self.repo.git.rev_parse('--git-path', 'hooks')
+        except (GitCommandError, TypeError, ValueError):
+            return False
+        
+        # fast-import does not run hooks, so leave repositories that use them on the index path
+        if any((hooks_dir / hook).exists() for hook in ("pre-commit", "commit-msg", "prepare-commit-msg", "post-commit")):
+            return False
+        
+        for file_path in file_paths:
+            status = statuses.get(file_path, "")
+            if status[:1] in ("R", "C", "U") or status[1:2] == "U":
+                return False
+            if "\n" in file_path or file_path.startswith('"'):
+                return False
+            full_path = Path(self.repo.working_dir) / file_path
+            if full_path.is_symlink() or full_path.is_dir():
+                return False
+        
+        # fast-import stores working tree bytes as-is and cannot sign, so filters,
+        # line ending conversion and signed commits need a real git commit
+        if self._config_value('commit.gpgsign', '--type=bool') == 'true':
+            return False
+        if self._config_value('core.autocrlf', '--type=bool-or-str') in ('true', 'input'):
+            return False
+        try:
+            attributes = self.repo.git.check_attr(
+                '-z', 'filter', 'text', 'eol', 'working-tree-encoding', '--', *file_paths
+            ).split('\0')
+        except GitCommandError:
+            return False
+        # Output is path, attribute, value triples
+        return all(value == 'unspecified' for value in attributes[2::3])
+    
+    def _config_value(self, key: str, *options: str) -> Optional[str]:
+        """Get a git config value, or None if it is not set."""
+        try:
+            return self.repo.git.config(*options, '--get', key)
+        except GitCommandError:
+            return None
+    
+    def atomic_commit_stream(self, commits: List[ProposedCommit]) -> List[str]:
+        """Create one commit per file through a single git fast-import pass.
+        
+        The working tree content of each commit's file (or its deletion) becomes
+        the only change in that commit. Returns the new commit hashes in order.
+        Raises GitRepositoryError only while the branch is still untouched; the
+        index is left for sync_index() to update.
+        """
+        if not commits:
+            return []
+        
+        file_paths = [commit_data.file_path for commit_data in commits]
+        try:
+            branch = self.repo.active_branch.name
+            parent = self.repo.head.commit.hexsha
+            author = self.repo.git.var('GIT_AUTHOR_IDENT')
+            committer = self.repo.git.var('GIT_COMMITTER_IDENT')
+            # Like git add, keep the recorded mode when the executable bit is not trusted
+            trust_exec_bit = self._config_value('core.filemode', '--type=bool') != 'false'
+            index_modes = {} if trust_exec_bit else self._index_modes(file_paths)
+        except (GitCommandError, TypeError, ValueError) as e:
+            raise GitRepositoryError(f"Cannot stream commits: {e}")
+        
+        stream = bytearray()
+        for mark, commit_data in enumerate(commits, 1):
+            file_path = commit_data.file_path
+            message = commit_data.message.encode()
+            if not message.endswith(b"\n"):
+                message += b"\n"
+            
+            stream += f"commit refs/heads/{branch}\nmark :{mark}\n".encode()
+            stream += f"author {author}\ncommitter {committer}\n".encode()
+            stream += b"data %d\n%s" % (len(message), message)
+            if mark == 1:
+                stream += f"from {parent}\n".encode()
+            
+            full_path = Path(self.repo.working_dir) / file_path
+            if full_path.exists():
+                if trust_exec_bit:
+                    mode = "100755" if full_path.stat().st_mode & stat.S_IXUSR else "100644"
+                else:
+                    mode = index_modes.get(file_path, "100644")
+                content = full_path.read_bytes()
+                stream += f"M {mode} inline {file_path}\n".encode()
+                stream += b"data %d\n%s\n" % (len(content), content)
+            else:
+                stream += f"D {file_path}\n".encode()
+            stream += b"\n"
+        
+        with tempfile.TemporaryDirectory() as marks_dir:
+            # The marks file maps each commit to its hash without asking git again afterwards
+            marks_file = Path(marks_dir) / "marks"
+            result = subprocess.run(
+                ["git", "fast-import", "--quiet", f"--export-marks={marks_file}"],
+                input=bytes(stream),
+                cwd=self.repo.working_dir,
+                capture_output=True
+            )
+            if result.returncode != 0:
+                raise GitRepositoryError(f"git fast-import failed: {result.stderr.decode(errors='replace').strip()}")
+            marks = dict(line.split() for line in marks_file.read_text().splitlines() if line)
+        
+        hashes = [marks[f":{mark}"] for mark in range(1, len(commits) + 1)]
+        for commit_hash, commit_data in zip(hashes, commits):
+            logger.info("Created commit {}: {}", commit_hash[:8], commit_data.message)
+        return hashes
+    
+    def _index_modes(self, file_paths: List[str]) -> Dict[str, str]:
+        """Get the index mode of each tracked path, in one git call."""
+        modes = {}
+        for entry in self.repo.git.ls_files('-s', '-z', '--', *file_paths).split('\0'):
+            # Entries read "<mode> <object> <stage>\t<path>"
+            info, _, path = entry.partition('\t')
+            if path:
+                modes[path] = info.split(' ', 1)[0]
+        return modes
+    
+    def sync_index(self, file_paths: List[str]) -> None:
+        """Bring the index entries of committed paths in line with HEAD."""
+        if not file_paths:
+            # A pathless reset would unstage everything
+            return
+        try:
+            self.repo.git.reset('-q', 'HEAD', '--', *file_paths)
+        except GitCommandError as e:
+            raise GitRepositoryError(f"Failed to update the index: {e}")
+    
     def push(self, remote: str = "origin", branch: Optional[str] = None) -> None:
         """Push commits to remote repository."""
         try:
@@ -2,7 +2,9 @@
 Beautiful console interface with Rich components.
 """
 
-from typing import List, Optional, Dict, Any
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import List, Optional, Dict, Any, Callable, Iterator
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.table import Table
@@ -19,7 +21,7 @@ import sys
 import os
 import asyncio
 
-from ..git_ops.repository import FileChange, RepositoryState
+from ..git_ops.repository import FileChange, RepositoryState, ProposedCommit
 from ..config.settings import Settings
 
 
@@ -194,7 +196,16 @@ class SmartCommitConsole:
         self.console.print(message_panel)
         self.console.print()
     
-    def show_atomic_commits_preview(self, commits: List[Dict[str, str]], selected_index: int = -1, editing_index: int = -1) -> Table:
+    @contextmanager
+    def live_preview(self, title: str = "Generating Commit Message") -> Iterator[Callable[[str], None]]:
+        """Render text in a panel that updates as it is generated; yields the update function."""
+        def render(text: str) -> Panel:
+            return Panel(Text(text), title=title, box=box.ROUNDED, style="blue")
+        
+        with Live(render(""), console=self.console, transient=True, refresh_per_second=12) as live:
+            yield lambda text: live.update(render(text))
+    
+    def show_atomic_commits_preview(self, commits: List[ProposedCommit], selected_index: int = -1, editing_index: int = -1) -> Table:
         """Show atomic commits preview with optional highlighting and inline editing."""
         table = Table(box=box.SIMPLE_HEAD, expand=True)
         table.add_column("#", style="bold cyan", width=4)
@@ -206,29 +217,29 @@ class SmartCommitConsole:
                 # Editing row - show actual editing state  
                 table.add_row(
                     f"[yellow bold]{i}[/yellow bold]",
-                    f"[yellow]{commit['file_path']}[/yellow]", 
-                    f"[black on white]{commit['message']}[/black on white]"
+                    f"[yellow]{commit.file_path}[/yellow]", 
+                    f"[black on white]{commit.message}[/black on white]"
                 )
             elif i - 1 == selected_index:
                 # Highlighted row with different styling
                 table.add_row(
                     f"[reverse bold cyan]{i}[/reverse bold cyan]",
-                    f"[reverse bold]{commit['file_path']}[/reverse bold]", 
-                    f"[reverse bold green]{commit['message']}[/reverse bold green]"
+                    f"[reverse bold]{commit.file_path}[/reverse bold]", 
+                    f"[reverse bold green]{commit.message}[/reverse bold green]"
                 )
             else:
                 # Normal row
                 table.add_row(
                     str(i),
-                    commit["file_path"],
-                    commit["message"]
+                    commit.file_path,
+                    commit.message
                 )
         
         return table
     
-    def _inline_edit_commit_message(self, commits: List[Dict[str, str]], edit_index: int, current_index: int) -> Optional[str]:
+    def _inline_edit_commit_message(self, commits: List[ProposedCommit], edit_index: int, current_index: int) -> Optional[str]:
         """Handle true inline editing directly in the table cell."""
-        current_message = commits[edit_index]["message"]
+        current_message = commits[edit_index].message
         editing_message = current_message
         cursor_pos = len(current_message)
         
@@ -264,16 +275,17 @@ class SmartCommitConsole:
             except KeyboardInterrupt:
                 return None
     
-    def _display_table_with_inline_editing(self, commits: List[Dict[str, str]], selected_index: int, editing_index: int, editing_message: str = "", cursor_pos: int = 0):
+    def _display_table_with_inline_editing(self, commits: List[ProposedCommit], selected_index: int, editing_index: int, editing_message: str = "", cursor_pos: int = 0):
         """Display table with real-time inline editing."""
         # Create a copy of commits with the editing message
         display_commits = commits.copy()
         if editing_index >= 0:
-            display_commits[editing_index] = display_commits[editing_index].copy()
             # Show current editing state with cursor
             before_cursor = editing_message[:cursor_pos]
             after_cursor = editing_message[cursor_pos:]
-            display_commits[editing_index]["message"] = f"{before_cursor}▋{after_cursor}"
+            display_commits[editing_index] = replace(
+                display_commits[editing_index], message=f"{before_cursor}▋{after_cursor}"
+            )
         
         table_lines = len(commits) + 5
         
@@ -309,7 +321,7 @@ class SmartCommitConsole:
             self.console.print("[yellow]Using simplified input mode...[/yellow]")
             return input("Press Enter to continue or 'c' to cancel: ")[0:1] or '\r'
     
-    def interactive_atomic_commits_approval(self, commits: List[Dict[str, str]], start_index: int = 0) -> tuple[str, int]:
+    def interactive_atomic_commits_approval(self, commits: List[ProposedCommit], start_index: int = 0) -> tuple[str, int]:
         """Interactive approval with arrow key navigation, fallback to simple mode if needed."""
         # Check if terminal supports interactive mode
         try:
@@ -394,7 +406,7 @@ class SmartCommitConsole:
             except KeyboardInterrupt:
                 return "cancel", -1
     
-    def _display_table_with_selection(self, commits: List[Dict[str, str]], selected_index: int):
+    def _display_table_with_selection(self, commits: List[ProposedCommit], selected_index: int):
         """Display table with current selection using minimal cursor positioning."""
         # Use more efficient cursor positioning - only redraw the table area
         # Move to beginning of table, clear to end of screen, then redraw
@@ -411,7 +423,7 @@ class SmartCommitConsole:
         self.console.print(table, end="")
         print()  # Add final newline
     
-    def _simplified_approval(self, commits: List[Dict[str, str]]) -> tuple[str, int]:
+    def _simplified_approval(self, commits: List[ProposedCommit]) -> tuple[str, int]:
         """Simplified approval for environments that don't support interactive navigation."""
         self.console.print("\n[bold blue]Proposed Atomic Commits[/bold blue]\n")
         table = self.show_atomic_commits_preview(commits)
@@ -556,15 +568,15 @@ class SmartCommitConsole:
         self.console.print(table)
         self.console.print()
     
-    def show_commit_summary(self, commits: List[Dict[str, Any]]) -> None:
+    def show_commit_summary(self, commits: List[ProposedCommit]) -> None:
         """Show summary of created commits."""
         self.console.print("[bold green]Commits Created Successfully![/bold green]")
         self.console.print()
         
         for i, commit in enumerate(commits, 1):
-            commit_hash = commit.get("hash", "")[:8]
-            file_path = commit.get("file_path", "")
-            message = commit.get("message", "")
+            commit_hash = (commit.hash or "")[:8]
+            file_path = commit.file_path
+            message = commit.message
             
             self.console.print(
                 f"[bold cyan]{i}.[/bold cyan] "
@@ -0,0 +1,167 @@
+"""
+Persistent AI response caching for Smart Commit.
+
+Commit messages generated for a prompt are stored on disk so that re-running
+on an unchanged diff (dry runs, retries after a reset) skips the AI round trip.
+"""
+
+import hashlib
+import math
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+from typing import List, Optional
+from loguru import logger
+
+
+class DiskCache:
+    """SQLite-backed cache of AI results keyed by backend, model and prompt."""
+    
+    def __init__(self, path: Path, ttl: int = 86400):
+        self._path = path
+        self._ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    @staticmethod
+    def make_key(backend_type: str, model: str, prompt: str) -> str:
+        """Build the cache key for a prompt sent to a specific backend and model."""
+        return hashlib.blake2b(f"{backend_type}|{model}|{prompt}".encode(), digest_size=16).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, model TEXT, created REAL, response TEXT)"
+            )
+        return self._conn
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if missing or expired."""
+        try:
+            row = self._connect().execute(
+                "SELECT created, response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"LLM cache read failed: {e}")
+            return None
+        
+        if row is None or time.time() - row[0] > self._ttl:
+            return None
+        
+        logger.debug(f"LLM cache hit for {key}")
+        return row[1]
+    
+    def set(self, key: str, model: str, response: str) -> None:
+        """Store a response in the cache."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, created, response) VALUES (?, ?, ?, ?)",
+                    (key, model, time.time(), response)
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"LLM cache write failed: {e}")
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            logger.debug(f"LLM cache clear failed: {e}")
+    
+    def close(self) -> None:
+        """Close the cache database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class SemanticCache:
+    """SQLite-backed cache that matches file diffs by embedding similarity."""
+    
+    def __init__(self, path: Path, namespace: str, ttl: int = 86400, window: int = 200):
+        self._path = path
+        self._namespace = namespace
+        self._ttl = ttl
+        self._window = window
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path)
+            # Older entries embedded whole prompts, which can't be matched to a file safely
+            self._conn.execute("DROP TABLE IF EXISTS embeddings")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_embeddings "
+                "(namespace TEXT, tag TEXT, created REAL, embedding BLOB, response TEXT)"
+            )
+        return self._conn
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> array:
+        """Scale an embedding to unit length so similarity is a dot product."""
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return array('f', (x / norm for x in embedding))
+    
+    def query(self, embedding: List[float], tag: str, threshold: float) -> Optional[str]:
+        """Get the response of the most similar recent entry with this tag at or above threshold."""
+        vector = self._normalize(embedding)
+        try:
+            rows = self._connect().execute(
+                "SELECT embedding, response FROM file_embeddings "
+                "WHERE namespace = ? AND tag = ? AND created > ? ORDER BY created DESC LIMIT ?",
+                (self._namespace, tag, time.time() - self._ttl, self._window)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Semantic cache read failed: {e}")
+            return None
+        
+        best_score, best_response = threshold, None
+        for blob, response in rows:
+            stored = array('f')
+            stored.frombytes(blob)
+            if len(stored) != len(vector):
+                continue
+            score = sum(a * b for a, b in zip(vector, stored))
+            if score >= best_score:
+                best_score, best_response = score, response
+        
+        if best_response is not None:
+            logger.debug(f"Semantic cache hit (similarity {best_score:.3f})")
+        return best_response
+    
+    def add(self, embedding: List[float], tag: str, response: str) -> None:
+        """Store a response under its diff embedding and tag."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO file_embeddings (namespace, tag, created, embedding, response) VALUES (?, ?, ?, ?, ?)",
+                    (self._namespace, tag, time.time(), self._normalize(embedding).tobytes(), response)
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Semantic cache write failed: {e}")
+    
+    def clear(self) -> None:
+        """Remove all entries for this namespace."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM file_embeddings WHERE namespace = ?", (self._namespace,))
+        except sqlite3.Error as e:
+            logger.debug(f"Semantic cache clear failed: {e}")
+    
+    def close(self) -> None:
+        """Close the cache database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -42,6 +42,13 @@ class MessageExtractor:
             rf'({types_pattern})\b',
             re.IGNORECASE
         )
+        
+        # Pattern for numbered entries of a batched response, e.g. "FILE 2: fix(x): ..." or "<<FILE 2>> ..."
+        # The FILE marker is required: bare "1." list numbering is 1-based and would shift every message
+        self.pattern_batch_entry = re.compile(
+            r'^[\s*<\[-]*FILE\s*(\d+)\s*(?:>>|[:.)\]])\s*(.+)$',
+            re.MULTILINE | re.IGNORECASE
+        )
     
     def extract_commit_message(self, raw_response: str) -> Optional[str]:
         """Extract commit message using multiple strategies."""
@@ -96,6 +103,18 @@ class MessageExtractor:
         logger.debug(f"Failed to extract from cleaned response: '{cleaned_response}'")
         return None
     
+    def extract_batch(self, raw_response: str, count: int) -> List[Optional[str]]:
+        """Extract numbered commit messages from a batched response that is not valid JSON."""
+        messages: List[Optional[str]] = [None] * count
+        
+        for match in self.pattern_batch_entry.finditer(raw_response):
+            index = int(match.group(1))
+            if 0 <= index < count and messages[index] is None:
+                messages[index] = self.extract_commit_message(match.group(2).strip().strip('"\''))
+        
+        logger.debug(f"Extracted {sum(m is not None for m in messages)}/{count} messages from batched response")
+        return messages
+    
     def _clean_response(self, response: str) -> str:
         """Clean AI response by removing markdown and formatting."""
         # Extract content from ChatML assistant response
@@ -3,10 +3,74 @@ Optimized AI prompt templates for Qwen2.5-Coder-7B-Instruct.
 Based on 2025 best practices for code analysis and commit message generation.
 """
 
+from functools import lru_cache
 from typing import List, Dict, Optional
 from ..git_ops.repository import FileChange, RepositoryState
 
 
+# Scopes for root level files; everything else is scoped by its top-level directory
+ROOT_FILE_SCOPES = {
+    'install.py': 'install',
+    'pyproject.toml': 'build',
+    'README.md': 'root',      # Changed from 'docs' to avoid docs(docs):
+    'CLAUDE.md': 'root',      # Changed from 'docs' to avoid docs(docs):
+    'LICENSE': 'root'         # Changed from 'docs' to avoid docs(docs):
+}
+
+NEW_FILE_INSTRUCTIONS = """You are an expert developer analyzing a NEW FILE being added to the repository.
+
+## YOUR TASK
+Analyze the NEW file described below and generate a commit message describing what NEW functionality is being introduced.
+
+## COMMIT TYPE RULES FOR NEW FILES
+- **Use `feat:` for new scripts, tools, or functionality**
+- **Use `docs:` for new documentation or README files**
+- **Use `chore:` for new configuration files**
+- **NEVER use `refactor:` for new files**
+- **NEVER use `fix:` for new files**
+
+## EXAMPLES FOR NEW FILES
+✅ `feat(scope): add new user management script`
+✅ `docs(scope): add comprehensive API documentation`
+✅ `chore(scope): add configuration file for deployment`
+
+## FORMAT REQUIREMENTS
+- **Format**: EXACTLY type(scope): description, using the scope given for the file
+- **Description**: MUST be a complete sentence describing what NEW capability is being introduced
+- **NEVER end with prepositions**: Don't end with "for", "to", "with", etc.
+- **Be specific**: Instead of "add script for", say "add script for converting file formats"
+
+## RESPONSE RULES
+1. Generate ONLY the commit message in the format type(scope): description
+2. The description MUST be a complete, grammatically correct sentence
+3. NEVER leave sentences incomplete or hanging with prepositions
+4. Be specific about what NEW functionality you're adding"""
+
+MODIFIED_FILE_INSTRUCTIONS = """You are an expert developer analyzing a MODIFIED file in the repository.
+
+## YOUR TASK
+Analyze the changes to the existing file described below and generate a commit message describing what was modified.
+
+## COMMIT TYPE RULES FOR MODIFICATIONS
+- **Use `feat:` for new functionality added to existing files**
+- **Use `fix:` for bug fixes or corrections**
+- **Use `refactor:` for code restructuring without changing behavior**
+- **Use `docs:` for documentation updates**
+- **Use `chore:` for maintenance tasks**
+
+## FORMAT REQUIREMENTS
+- **Format**: EXACTLY type(scope): description, using the scope given for the file
+- **Description**: MUST be a complete sentence with specific details
+- **NEVER end with prepositions**: Don't end with "for", "to", "with", etc.
+- **Be specific**: Instead of "add error handling for", say "add error handling for missing .env file"
+
+## RESPONSE RULES
+1. Generate ONLY the commit message in the format type(scope): description
+2. The description MUST be a complete, grammatically correct sentence
+3. NEVER leave sentences incomplete or hanging with prepositions
+4. Be specific about what you're changing, not just the action"""
+
+
 class PromptBuilder:
     """Build optimized prompts for Qwen2.5-Coder with structured analysis."""
     
@@ -52,7 +116,8 @@ class PromptBuilder:
     def _build_new_file_prompt_clean(self, file_path: str, scope: str, diff_content: str) -> str:
         """Build completely clean prompt for NEW files - no confusion possible."""
         
-        prompt = f"""You are an expert developer analyzing a NEW FILE being added to the repository.
+        # The instructions come first and never vary, so backends can reuse their cached prefix
+        prompt = f"""{NEW_FILE_INSTRUCTIONS}
 
 ## CRITICAL: THIS IS A NEW FILE
 - **File**: {file_path}
@@ -63,41 +128,17 @@ class PromptBuilder:
 ## FILE CONTENT ANALYSIS
 {self._get_diff_analysis_for_prompt(diff_content, file_path)}
 
-## YOUR TASK
-Analyze this NEW file and generate a commit message describing what NEW functionality is being introduced.
-
-## COMMIT TYPE RULES FOR NEW FILES
-- **Use `feat:` for new scripts, tools, or functionality**
-- **Use `docs:` for new documentation or README files**
-- **Use `chore:` for new configuration files**
-- **NEVER use `refactor:` for new files**
-- **NEVER use `fix:` for new files**
-
-## EXAMPLES FOR NEW FILES
-✅ `feat({scope}): add new user management script`
-✅ `docs({scope}): add comprehensive API documentation`
-✅ `chore({scope}): add configuration file for deployment`
-
-## FORMAT REQUIREMENTS
-- **Format**: EXACTLY type({scope}): description
+## RESPONSE
 - **Required scope in parentheses**: ({scope})
-- **Description**: MUST be a complete sentence describing what NEW capability is being introduced
-- **NEVER end with prepositions**: Don't end with "for", "to", "with", etc.
-- **Be specific**: Instead of "add script for", say "add script for converting file formats"
-
-## RESPONSE RULES
-1. Generate ONLY the commit message in this EXACT format: type({scope}): description
-2. The description MUST be a complete, grammatically correct sentence
-3. NEVER leave sentences incomplete or hanging with prepositions
-4. Be specific about what NEW functionality you're adding
+- Generate ONLY the commit message in this EXACT format: type({scope}): description
 
 Example for this file: feat({scope}): add new user authentication system"""
 
         # Log the final prompt for debugging
         from loguru import logger
-        logger.info(f"📝 NEW FILE PROMPT FOR {file_path}:")
-        logger.info(f"📊 Prompt length: {len(prompt)} characters")
-        logger.info(f"🔍 Scope used: {scope}")
+        logger.debug("📝 NEW FILE PROMPT FOR {}:", file_path)
+        logger.debug("📊 Prompt length: {} characters", len(prompt))
+        logger.debug("🔍 Scope used: {}", scope)
         
         return prompt
 
@@ -106,7 +147,8 @@ Example for this file: feat({scope}): add new user authentication system"""
         
         change_desc = self._get_change_description(change_type)
         
-        prompt = f"""You are an expert developer analyzing a MODIFIED file in the repository.
+        # The instructions come first and never vary, so backends can reuse their cached prefix
+        prompt = f"""{MODIFIED_FILE_INSTRUCTIONS}
 
 ## FILE ANALYSIS
 - **File**: {file_path}
@@ -117,39 +159,53 @@ Example for this file: feat({scope}): add new user authentication system"""
 ## CHANGES ANALYSIS
 {self._get_diff_analysis_for_prompt(diff_content, file_path)}
 
-## YOUR TASK
-Analyze the changes to this existing file and generate a commit message describing what was modified.
-
-## COMMIT TYPE RULES FOR MODIFICATIONS
-- **Use `feat:` for new functionality added to existing files**
-- **Use `fix:` for bug fixes or corrections**
-- **Use `refactor:` for code restructuring without changing behavior**
-- **Use `docs:` for documentation updates**
-- **Use `chore:` for maintenance tasks**
-
-## FORMAT REQUIREMENTS
-- **Format**: EXACTLY type({scope}): description
+## RESPONSE
 - **Required scope in parentheses**: ({scope})
-- **Description**: MUST be a complete sentence with specific details
-- **NEVER end with prepositions**: Don't end with "for", "to", "with", etc.
-- **Be specific**: Instead of "add error handling for", say "add error handling for missing .env file"
-
-## RESPONSE RULES
-1. Generate ONLY the commit message in this EXACT format: type({scope}): description
-2. The description MUST be a complete, grammatically correct sentence
-3. NEVER leave sentences incomplete or hanging with prepositions
-4. Be specific about what you're changing, not just the action
+- Generate ONLY the commit message in this EXACT format: type({scope}): description
 
 Example for this file: docs({scope}): update file documentation with new sections"""
 
         # Log the final prompt for debugging
         from loguru import logger
-        logger.info(f"📝 MODIFIED FILE PROMPT FOR {file_path}:")
-        logger.info(f"📊 Prompt length: {len(prompt)} characters")
-        logger.info(f"🔍 Scope used: {scope}")
+        logger.debug("📝 MODIFIED FILE PROMPT FOR {}:", file_path)
+        logger.debug("📊 Prompt length: {} characters", len(prompt))
+        logger.debug("🔍 Scope used: {}", scope)
         
         return prompt
     
+    def build_batch_commit_prompt(self, files: List[FileChange]) -> str:
+        """Build one prompt asking for a separate commit message for each file."""
+        
+        file_blocks = []
+        for index, file_change in enumerate(files):
+            file_blocks.append(
+                f"<<FILE {index}>>\n"
+                f"- **File**: {file_change.file_path}\n"
+                f"- **Status**: {self._get_change_description(file_change.change_type)}\n"
+                f"- **Scope**: {self._extract_scope(file_change.file_path)}\n\n"
+                f"{self._get_focused_diff(file_change.diff_content)}\n"
+                f"<<END>>"
+            )
+        files_section = "\n\n".join(file_blocks)
+        
+        prompt = f"""You are an expert developer writing ONE conventional commit message for EACH file below.
+
+## FILES
+{files_section}
+
+## COMMIT MESSAGE RULES
+- **Format**: EXACTLY type(scope): description, using the scope given for that file
+- **Max Length**: {self.character_limit} characters per message
+- **Use `feat:` for new functionality, `fix:` for bug fixes, `refactor:` for restructuring, `docs:` for documentation, `chore:` for maintenance**
+- **NEVER use `refactor:` or `fix:` for new files**
+- Each description MUST be a complete sentence about that file's changes only
+
+## RESPONSE FORMAT
+Respond with ONLY a JSON array containing one object per file, in file order:
+[{{"index": 0, "message": "type(scope): description"}}, {{"index": 1, "message": "type(scope): description"}}]"""
+
+        return prompt
+    
     def _build_multi_file_prompt(self, repo_state: RepositoryState) -> str:
         """Build optimized multi-file prompt for repository-wide changes."""
         
@@ -213,23 +269,18 @@ Analyze the changes above and generate ONLY the commit message:"""
 
         return prompt
     
-    def _extract_scope(self, file_path: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_scope(file_path: str) -> str:
         """Extract conventional commit scope from file path."""
-        parts = file_path.split('/')
+        first, sep, _ = file_path.partition('/')
         
         # Root level files
-        if len(parts) == 1:
-            scope_map = {
-                'install.py': 'install',
-                'pyproject.toml': 'build',
-                'README.md': 'root',      # Changed from 'docs' to avoid docs(docs):
-                'CLAUDE.md': 'root',      # Changed from 'docs' to avoid docs(docs):
-                'LICENSE': 'root'         # Changed from 'docs' to avoid docs(docs):
-            }
-            return scope_map.get(parts[0], 'root')
+        if not sep:
+            return ROOT_FILE_SCOPES.get(first, 'root')
         
         # Use first directory as scope
-        return parts[0]
+        return first
     
     def _get_focused_diff(self, diff_content: str) -> str:
         """Get focused diff content for analysis."""
@@ -244,28 +295,29 @@ Analyze the changes above and generate ONLY the commit message:"""
         """Get intelligent diff analysis for the prompt instead of raw diff content."""
         from loguru import logger
         
-        logger.info(f"🔍 ANALYZING DIFF FOR: {file_path}")
-        logger.info(f"📊 Raw diff content length: {len(diff_content)} characters")
+        logger.debug("🔍 ANALYZING DIFF FOR: {}", file_path)
+        logger.debug("📊 Raw diff content length: {} characters", len(diff_content))
         
         if not diff_content:
-            logger.warning(f"❌ No diff content available for {file_path}")
+            logger.warning("❌ No diff content available for {}", file_path)
             return "No diff content available"
         
         # Check if this is a new file
         is_new_file = diff_content.startswith('--- /dev/null')
         
-        lines = diff_content.split('\n')
-        logger.info(f"📈 Diff has {len(lines)} lines")
+        # Counted rather than split; new files are split once in _get_new_file_analysis
+        line_count = diff_content.count('\n') + 1
+        logger.debug("📈 Diff has {} lines", line_count)
         
         # Special handling for new files
         if is_new_file:
-            logger.info(f"🆕 NEW FILE DETECTED: {file_path} - using new file analysis")
+            logger.debug("🆕 NEW FILE DETECTED: {} - using new file analysis", file_path)
             return self._get_new_file_analysis(diff_content, file_path)
         
         # For normal diffs, provide focused content
-        logger.info(f"✅ NORMAL DIFF: {len(lines)} lines - using raw content")
+        logger.debug("✅ NORMAL DIFF: {} lines - using raw content", line_count)
         result = self._get_normal_diff_content(diff_content)
-        logger.info(f"📝 Using normal diff content: {len(result)} characters")
+        logger.debug("📝 Using normal diff content: {} characters", len(result))
         return result
 
     def _get_new_file_analysis(self, diff_content: str, file_path: str) -> str:
@@ -297,10 +349,7 @@ Analyze the changes above and generate ONLY the commit message:"""
         analysis += f"**Purpose**: {file_type['purpose']}\n\n"
         
         if metadata_lines:
-            analysis += "**Context**:\n"
-            for meta in metadata_lines:
-                analysis += f"- {meta}\n"
-            analysis += "\n"
+            analysis += "**Context**:\n" + "".join(f"- {meta}\n" for meta in metadata_lines) + "\n"
         
         analysis += "**Content Preview**:\n"
         analysis += "```\n"
@@ -63,6 +63,91 @@ class SecurityScanner:
             
         return result
     
+    async def scan_files(self, repo_path: Path, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Scan several files or directories in one TruffleHog run.
+        
+        Args:
+            repo_path: Path to git repository
+            file_paths: Repository-relative paths to scan; missing paths are skipped
+            
+        Returns:
+            Dict mapping each existing path to a result shaped like scan_before_commit's
+        """
+        existing = [file_path for file_path in file_paths if (repo_path / file_path).exists()]
+        results = {
+            file_path: {
+                "scanner_available": self.trufflehog_available,
+                "secrets_found": False,
+                "should_block_commit": False,
+                "findings": [],
+                "scan_performed": False
+            }
+            for file_path in existing
+        }
+        
+        if not self.trufflehog_available or not existing:
+            logger.debug("TruffleHog not available or nothing to scan, skipping security scan")
+            return results
+        
+        try:
+            cmd = ["trufflehog", "filesystem", *(str(repo_path / file_path) for file_path in existing),
+                   "--json", "--no-verification"]
+            
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=repo_path
+            )
+            
+            stdout, stderr = await process.communicate()
+            scan_result = self._parse_trufflehog_output(stdout.decode(), stderr.decode())
+        except Exception as e:
+            logger.error(f"Security scan failed: {e}")
+            # Don't block commits on scanner errors
+            return results
+        
+        # Findings name the file they came from, which maps them back to a scanned path
+        roots = {os.path.normpath(repo_path / file_path): file_path for file_path in existing}
+        unmatched = False
+        for finding in scan_result["findings"]:
+            owner = self._find_scanned_path(finding["file"], repo_path, roots)
+            if owner is None:
+                unmatched = True
+                break
+            results[owner]["findings"].append(finding)
+        
+        if unmatched:
+            # Without a file name a finding can't be attributed, so scan each path on its own
+            logger.debug("Could not attribute a TruffleHog finding, scanning files individually")
+            per_file = await asyncio.gather(*(self.scan_before_commit(repo_path, [file_path]) for file_path in existing))
+            return dict(zip(existing, per_file))
+        
+        for result in results.values():
+            result["scan_performed"] = True
+            result["secrets_found"] = result["should_block_commit"] = bool(result["findings"])
+        
+        flagged = sum(1 for result in results.values() if result["secrets_found"])
+        if flagged:
+            logger.warning(f"Security scan found potential secrets in {flagged} of {len(existing)} files")
+        else:
+            logger.info(f"Security scan of {len(existing)} files completed - no secrets detected")
+        
+        return results
+    
+    @staticmethod
+    def _find_scanned_path(finding_file: str, repo_path: Path, roots: Dict[str, str]) -> Optional[str]:
+        """Get the scanned path a finding's file is, or lies under, or None if unknown."""
+        current = os.path.normpath(os.path.join(repo_path, finding_file))
+        while True:
+            if current in roots:
+                return roots[current]
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+    
     async def _scan_repository(self, repo_path: Path) -> Dict[str, Any]:
         """Scan entire repository filesystem."""
         try:
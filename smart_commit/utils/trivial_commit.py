@@ -0,0 +1,47 @@
+"""
+Rule-based commit messages for trivial files.
+
+Boilerplate changes such as empty files, lockfile updates or a new license get
+the same message from the AI every time, so they are answered without a request.
+"""
+
+from typing import Optional
+from ..git_ops.repository import FileChange
+
+
+LOCKFILES = frozenset({
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock",
+    "Pipfile.lock", "uv.lock", "Cargo.lock", "Gemfile.lock", "composer.lock", "go.sum",
+})
+
+LICENSE_FILES = frozenset({"LICENSE", "LICENSE.md", "LICENSE.txt", "COPYING"})
+
+README_FILES = frozenset({"README.md", "README.rst", "README.txt", "README"})
+
+
+def try_trivial(file_change: FileChange, scope: str) -> Optional[str]:
+    """Get a commit message for a trivial file change, or None if the AI should decide."""
+    file_path = file_change.file_path
+    basename = file_path.rstrip('/').rpartition('/')[2]
+    change_type = file_change.change_type
+    
+    if change_type == 'D' or file_path.endswith('/'):
+        return None
+    
+    if change_type == 'A' and file_change.lines_added == 0 and file_change.lines_removed == 0:
+        return f"chore({scope}): add empty {basename}"
+    
+    if basename == ".gitignore":
+        if change_type == 'A':
+            return f"chore({scope}): add .gitignore"
+        if file_change.lines_removed == 0 and file_change.lines_added > 0:
+            return f"chore({scope}): update .gitignore"
+    
+    if basename in LOCKFILES:
+        verb = "add" if change_type == 'A' else "update"
+        return f"chore({scope}): {verb} {basename}"
+    
+    if change_type == 'A' and (basename in LICENSE_FILES or basename in README_FILES):
+        return f"docs({scope}): add {basename}"
+    
+    return None
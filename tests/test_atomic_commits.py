@@ -0,0 +1,153 @@
+"""Atomic commits must come out the same whether they are streamed or committed file by file."""
+
+import asyncio
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+from smart_commit.core import SmartCommit
+from smart_commit.git_ops.repository import GitRepository, GitRepositoryError, ProposedCommit
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in the repository and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def make_repo(path: Path) -> Path:
+    """Create a repository with one commit holding a few tracked files."""
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    git(path, "config", "user.name", "Test User")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "config", "commit.gpgsign", "false")
+    (path / "a.txt").write_text("a\n")
+    (path / "old.txt").write_text("old\n")
+    (path / "tool.sh").write_text("echo tool\n")
+    (path / "staged.txt").write_text("staged\n")
+    (path / "src").mkdir()
+    (path / "src" / "keep.py").write_text("KEEP = 1\n")
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "initial")
+    return path
+
+
+def files_changes(repo: Path) -> List[str]:
+    """Modify, add, delete and make files executable; return the atomic units."""
+    (repo / "a.txt").write_text("a\nb\n")
+    (repo / "new.txt").write_text("new\n")
+    (repo / "old.txt").unlink()
+    (repo / "tool.sh").chmod(0o755)
+    (repo / "run.sh").write_text("echo run\n")
+    (repo / "run.sh").chmod(0o755)
+    return ["a.txt", "new.txt", "old.txt", "tool.sh", "run.sh"]
+
+
+def directory_changes(repo: Path) -> List[str]:
+    """Add an untracked directory and a new file under a tracked one; return the atomic units."""
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "x.py").write_text("X = 1\n")
+    (repo / "pkg" / "y.py").write_text("Y = 1\n")
+    (repo / "src" / "new.py").write_text("NEW = 1\n")
+    (repo / "a.txt").write_text("a\nb\n")
+    return ["pkg", "src/new.py", "a.txt"]
+
+
+def untrusted_mode_changes(repo: Path) -> List[str]:
+    """Edit a file that also gained a stray executable bit while core.fileMode is off."""
+    git(repo, "config", "core.fileMode", "false")
+    (repo / "tool.sh").write_text("echo changed\n")
+    (repo / "tool.sh").chmod(0o755)
+    (repo / "run.sh").write_text("echo run\n")
+    (repo / "run.sh").chmod(0o755)
+    return ["tool.sh", "run.sh"]
+
+
+def run_atomic_commits(repo: Path, file_paths: List[str], stream: bool, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Commit each path on its own through SmartCommit; return whether fast-import was used."""
+    # A change staged beforehand must stay staged and out of the atomic commits
+    (repo / "staged.txt").write_text("staged\nmore\n")
+    git(repo, "add", "staged.txt")
+
+    if not stream:
+        monkeypatch.setattr(GitRepository, "can_stream_commits", lambda self, paths, statuses: False)
+    streamed = []
+    original_stream = GitRepository.atomic_commit_stream
+
+    def recording_stream(self: GitRepository, commits: List[ProposedCommit]) -> List[str]:
+        streamed.append(True)
+        return original_stream(self, commits)
+
+    monkeypatch.setattr(GitRepository, "atomic_commit_stream", recording_stream)
+
+    smart_commit = SmartCommit(repo_path=repo)
+    proposed = [ProposedCommit(file_path=path, message=f"chore: update {path}\n\nBody for {path}") for path in file_paths]
+
+    async def no_secrets() -> Dict[str, Optional[Dict]]:
+        return {path: None for path in file_paths}
+
+    created = asyncio.run(smart_commit._create_atomic_commits(proposed, no_secrets()))
+    assert [commit.file_path for commit in created] == file_paths
+    assert all(commit.hash for commit in created)
+    return bool(streamed)
+
+
+def snapshot(repo: Path, count: int) -> Dict[str, object]:
+    """Describe the new commits, the index and the status in a timestamp-free form."""
+    commits = []
+    for rev in git(repo, "rev-list", f"-{count}", "--reverse", "HEAD").split():
+        commits.append((git(repo, "log", "-1", "--format=%B", rev), git(repo, "ls-tree", "-r", rev)))
+    return {
+        "commits": commits,
+        "index": git(repo, "ls-files", "-s"),
+        "status": git(repo, "status", "--porcelain", "-uall"),
+    }
+
+
+@pytest.mark.parametrize(
+    "make_changes, streamable",
+    [(files_changes, True), (directory_changes, False), (untrusted_mode_changes, True)]
+)
+def test_streamed_and_file_by_file_commits_match(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_changes: Callable[[Path], List[str]], streamable: bool
+) -> None:
+    results = []
+    for stream in (True, False):
+        repo = make_repo(tmp_path / ("streamed" if stream else "file-by-file"))
+        file_paths = make_changes(repo)
+        with monkeypatch.context() as patch:
+            # Directories are never streamed, so that batch always commits file by file
+            assert run_atomic_commits(repo, file_paths, stream, patch) == (stream and streamable)
+        results.append(snapshot(repo, len(file_paths)))
+
+    streamed, file_by_file = results
+    assert streamed == file_by_file
+    # Only the change staged beforehand is left over
+    assert file_by_file["status"] == "M  staged.txt\n"
+
+
+def test_executable_bits_follow_core_filemode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    repo = make_repo(tmp_path / "repo")
+    run_atomic_commits(repo, untrusted_mode_changes(repo), True, monkeypatch)
+
+    tree = git(repo, "ls-tree", "-r", "HEAD")
+    assert "100644 blob" in next(line for line in tree.splitlines() if line.endswith("\ttool.sh"))
+    assert "100644 blob" in next(line for line in tree.splitlines() if line.endswith("\trun.sh"))
+
+
+def test_index_failure_after_streaming_does_not_commit_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    repo = make_repo(tmp_path / "repo")
+    file_paths = files_changes(repo)
+
+    def failing_sync(self: GitRepository, paths: List[str]) -> None:
+        raise GitRepositoryError("index.lock exists")
+
+    monkeypatch.setattr(GitRepository, "sync_index", failing_sync)
+    assert run_atomic_commits(repo, file_paths, True, monkeypatch)
+
+    # One commit per file on top of the initial one, and no file-by-file retry
+    assert git(repo, "rev-list", "--count", "HEAD") == f"{len(file_paths) + 1}\n"